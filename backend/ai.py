@@ -53,44 +53,407 @@
 
 
 
+import asyncio
+import json
 import requests
+import httpx
 import os
+import threading
+import time
+from typing import Optional
 from dotenv import load_dotenv
 
+from backend.ai_cache import AI_CACHE_DISABLE, ResponseCache, cache_key, get_cache
+from backend.http_client import (
+    RETRYABLE_STATUSES,
+    CircuitBreaker,
+    CircuitOpenError,
+    backoff_delay,
+    make_session,
+    retry_after_seconds,
+)
+from backend.limiter import ConcurrencyLimiter, LimiterFull
+
+
 load_dotenv()
 
+GEMINI_POOL_SIZE = int(os.getenv("GEMINI_POOL_SIZE", "10"))  # keep-alive connections to the API
+GEMINI_CONNECT_TIMEOUT = float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "60"))  # read timeout per attempt
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))  # on 429/5xx/connection errors
+GEMINI_BREAKER_FAILURES = int(os.getenv("GEMINI_BREAKER_FAILURES", "5"))
+GEMINI_BREAKER_RESET = float(os.getenv("GEMINI_BREAKER_RESET", "30"))  # seconds before a trial call
+
+# one pool and one breaker for every wrapper: they all talk to the same upstream
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+breaker = CircuitBreaker("gemini", failure_threshold=GEMINI_BREAKER_FAILURES, reset_timeout=GEMINI_BREAKER_RESET)
+
+# caps concurrent upstream calls from the async wrapper (see backend/limiter.py)
+ai_limiter = ConcurrencyLimiter(
+    "gemini",
+    max_inflight=int(os.getenv("AI_MAX_INFLIGHT", "16")),
+    max_waiting=int(os.getenv("AI_MAX_QUEUE", "64")),
+)
+
+# /ai/*/batch: how much text goes into one Gemini call, and how many calls one request runs at once
+AI_BATCH_CHAR_BUDGET = int(os.getenv("AI_BATCH_CHAR_BUDGET", "12000"))
+AI_BATCH_MAX_ITEMS = int(os.getenv("AI_BATCH_MAX_ITEMS", "50"))
+AI_BATCH_CONCURRENCY = int(os.getenv("AI_BATCH_CONCURRENCY", "4"))
+
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = make_session(GEMINI_POOL_SIZE)
+    return _session
+
+
+def query_prompt(prompt: str, context: str = "") -> str:
+    return f"Context:\n{context}\n\nQuestion:\n{prompt}" if context else prompt
+
+def summarize_prompt(text: str, max_length: int = 120) -> str:
+    return f"Summarize the following text in under {max_length} words:\n\n{text}"
+
+def categorize_prompt(text: str) -> str:
+    return f"Suggest 3 short tags or categories for the following text:\n\n{text}"
+
+def parse_tags(raw: str) -> list[str]:
+    return [tag.strip() for tag in raw.replace("\n", ",").split(",") if tag.strip()]
+
+# batch prompts: items go in as a JSON array with batch-local ids, results come
+# back as a JSON array keyed by the same ids
+BATCH_FIELDS = {"categorize": "tags", "summarize": "summary"}
+
+def batch_prompt(op: str, texts: list[str], max_length: int = 120) -> str:
+    items = json.dumps([{"id": i, "text": t} for i, t in enumerate(texts)], ensure_ascii=False)
+    if op == "categorize":
+        task = 'suggest 3 short tags or categories for its text. Reply with a JSON array of {"id": <id>, "tags": [<tag>, ...]}'
+    else:
+        task = f'summarize its text in under {max_length} words. Reply with a JSON array of {{"id": <id>, "summary": "<summary>"}}'
+    return f"For each item below, {task}, one entry per item, and nothing else.\n\nItems:\n{items}"
+
+def parse_batch_results(raw: str, size: int, field: str) -> dict:
+    """{batch id: value} for every well-formed entry in a batch reply; anything else is left out."""
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.strip("`").removeprefix("json").strip()
+    try:
+        entries = json.loads(raw)
+    except ValueError:
+        return {}
+    results = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict) or not isinstance(entry.get("id"), int) or not 0 <= entry["id"] < size:
+            continue
+        value = entry.get(field)
+        if field == "tags" and isinstance(value, list) and all(isinstance(t, str) for t in value):
+            results[entry["id"]] = [t.strip() for t in value if t.strip()]
+        elif field == "summary" and isinstance(value, str) and value.strip():
+            results[entry["id"]] = value.strip()
+    return results
+
+def pack_batches(texts: list[str], char_budget: int = AI_BATCH_CHAR_BUDGET, max_items: int = AI_BATCH_MAX_ITEMS) -> list[list[int]]:
+    """Greedily group item indices so each group's text fits `char_budget` (an oversized item goes alone)."""
+    batches, current, used = [], [], 0
+    for i, text in enumerate(texts):
+        if current and (used + len(text) > char_budget or len(current) >= max_items):
+            batches.append(current)
+            current, used = [], 0
+        current.append(i)
+        used += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+def stream_chunk_text(data: dict) -> str:
+    """Text of one streamGenerateContent chunk ("" for chunks that only carry metadata)."""
+    candidates = data.get("candidates", [])
+    if not candidates:
+        return ""
+    parts = candidates[0].get("content", {}).get("parts", [])
+    return "".join(p.get("text", "") for p in parts)
+
+
 class GeminiWrapper:
-    def __init__(self, model: str = "gemini-2.0-flash"):
+    def __init__(self, model: str = "gemini-2.0-flash", cache: Optional[ResponseCache] = None, no_cache_ops=None):
         self.model = model
         self.api_key = os.getenv("GEMINI_API_KEY")  # set in .env or environment
+        self.cache = cache or get_cache()
+        # operations that always go to the network (see AI_CACHE_DISABLE)
+        self.no_cache_ops = set(AI_CACHE_DISABLE if no_cache_ops is None else no_cache_ops)
+        self.breaker = breaker
+        self.max_retries = GEMINI_MAX_RETRIES
+
+    def _url(self, method: str = "generateContent") -> str:
+        return f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:{method}?key={self.api_key}"
 
-    def _call(self, prompt: str):
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model}:generateContent?key={self.api_key}"
-        headers = {"Content-Type": "application/json"}
-        data = {
-            "contents": [{"parts": [{"text": prompt}]}]
-        }
-        resp = requests.post(url, headers=headers, json=data, timeout=60)
-        resp.raise_for_status()
-        candidates = resp.json().get("candidates", [])
+    def _cache_lookup(self, prompt: str, op: str):
+        """(cache key or None if op is not cached, cached text or None)"""
+        if op in self.no_cache_ops:
+            return None, None
+        key = cache_key(self.model, op, prompt)
+        return key, self.cache.get(key)
+
+    def _response_text(self, data: dict, key: Optional[str]) -> str:
+        candidates = data.get("candidates", [])
         if candidates and "content" in candidates[0]:
             parts = candidates[0]["content"].get("parts", [])
-            return parts[0].get("text", "") if parts else ""
+            text = parts[0].get("text", "") if parts else ""
+            if key is not None and text:
+                self.cache.set(key, text)
+            return text
         return "No response from Gemini"
 
+    def _call(self, prompt: str, op: str = "query"):
+        key, cached = self._cache_lookup(prompt, op)
+        if cached is not None:
+            return cached
+        data = self._post({"contents": [{"parts": [{"text": prompt}]}]})
+        return self._response_text(data, key)
+
+    def _post(self, payload: dict) -> dict:
+        """
+        POST generateContent over the shared pool. Retries 429/5xx and connection
+        errors with jittered backoff. A read timeout is not retried: it has already
+        cost GEMINI_TIMEOUT and another attempt would stack a second one on it.
+        Raises CircuitOpenError while the breaker is open.
+        """
+        session = get_session()
+        with self.breaker.call() as call:
+            error = None
+            for attempt in range(self.max_retries + 1):
+                wait = None
+                try:
+                    resp = session.post(self._url(), json=payload, timeout=(GEMINI_CONNECT_TIMEOUT, GEMINI_TIMEOUT))
+                except requests.ReadTimeout as e:
+                    error = e
+                    break
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = e
+                else:
+                    if resp.status_code not in RETRYABLE_STATUSES:
+                        # a 4xx is our fault, not the provider's: don't count it against the breaker
+                        call.success()
+                        resp.raise_for_status()
+                        return resp.json()
+                    error = requests.HTTPError(f"{resp.status_code} from Gemini", response=resp)
+                    wait = retry_after_seconds(resp)
+                if attempt < self.max_retries:
+                    time.sleep(wait if wait is not None else backoff_delay(attempt))
+            call.failure()
+            raise error
+
     def query(self, prompt: str, context: str = "") -> str:
-        full_prompt = f"Context:\n{context}\n\nQuestion:\n{prompt}" if context else prompt
-        return self._call(full_prompt)
+        return self._call(query_prompt(prompt, context), op="query")
 
     def summarize(self, text: str, max_length: int = 120) -> str:
-        prompt = f"Summarize the following text in under {max_length} words:\n\n{text}"
-        return self._call(prompt)
+        return self._call(summarize_prompt(text, max_length), op="summarize")
 
     def categorize(self, text: str) -> list[str]:
-        prompt = f"Suggest 3 short tags or categories for the following text:\n\n{text}"
-        raw = self._call(prompt)
-        return [tag.strip() for tag in raw.replace("\n", ",").split(",") if tag.strip()]
+        return parse_tags(self._call(categorize_prompt(text), op="categorize"))
     
     def query_voice(self, prompt: str) -> str:
-        return self._call(prompt)
+        return self._call(prompt, op="voice")
+
+
+# Async variant for the FastAPI handlers: awaiting Gemini doesn't hold a
+# threadpool thread, and the limiter caps how many calls are in flight upstream.
+_async_client: Optional[httpx.AsyncClient] = None
+
+def get_async_client() -> httpx.AsyncClient:
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(GEMINI_TIMEOUT, connect=GEMINI_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=GEMINI_POOL_SIZE, max_keepalive_connections=GEMINI_POOL_SIZE),
+        )
+    return _async_client
+
+async def close_async_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+class AsyncGeminiWrapper(GeminiWrapper):
+    def __init__(self, model: str = "gemini-2.0-flash", limiter: Optional[ConcurrencyLimiter] = None, **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.limiter = limiter or ai_limiter
+
+    async def _call(self, prompt: str, op: str = "query"):
+        key, cached = self._cache_lookup(prompt, op)
+        if cached is not None:
+            return cached
+        data = await self._post({"contents": [{"parts": [{"text": prompt}]}]})
+        return self._response_text(data, key)
+
+    async def _post(self, payload: dict) -> dict:
+        """
+        Same retry/breaker policy as GeminiWrapper._post; raises LimiterFull when
+        saturated. The limiter slot is taken before the breaker is consulted, so a
+        call rejected by the limiter never holds the half-open trial.
+        """
+        async with self.limiter:
+            with self.breaker.call() as call:
+                client = get_async_client()
+                error = None
+                for attempt in range(self.max_retries + 1):
+                    wait = None
+                    try:
+                        resp = await client.post(self._url(), json=payload)
+                    except httpx.ReadTimeout as e:
+                        error = e
+                        break
+                    except (httpx.TransportError, httpx.TimeoutException) as e:
+                        error = e
+                    else:
+                        if resp.status_code not in RETRYABLE_STATUSES:
+                            call.success()
+                            resp.raise_for_status()
+                            return resp.json()
+                        error = httpx.HTTPStatusError(f"{resp.status_code} from Gemini", request=resp.request, response=resp)
+                        wait = retry_after_seconds(resp)
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(wait if wait is not None else backoff_delay(attempt))
+                call.failure()
+                raise error
+
+    async def _stream(self, prompt: str, op: str = "query"):
+        """
+        Yield the answer as Gemini generates it (streamGenerateContent, SSE).
+        Connection errors and 429/5xx are retried until the first chunk arrives;
+        after that a failure ends the stream, as does a read timeout. The full
+        text is cached on success. A client that disconnects mid-stream releases
+        the breaker's half-open trial without a verdict.
+        """
+        key, cached = self._cache_lookup(prompt, op)
+        if cached is not None:
+            yield cached
+            return
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        async with self.limiter:
+            with self.breaker.call() as call:
+                client = get_async_client()
+                error = None
+                for attempt in range(self.max_retries + 1):
+                    wait = None
+                    parts = []
+                    try:
+                        async with client.stream("POST", self._url("streamGenerateContent") + "&alt=sse", json=payload) as resp:
+                            if resp.status_code not in RETRYABLE_STATUSES:
+                                if resp.is_error:
+                                    call.success()
+                                    await resp.aread()
+                                    resp.raise_for_status()
+                                async for line in resp.aiter_lines():
+                                    if not line.startswith("data:"):
+                                        continue
+                                    text = stream_chunk_text(json.loads(line[5:]))
+                                    if text:
+                                        parts.append(text)
+                                        yield text
+                                call.success()
+                                if key is not None and parts:
+                                    self.cache.set(key, "".join(parts))
+                                return
+                            error = httpx.HTTPStatusError(f"{resp.status_code} from Gemini", request=resp.request, response=resp)
+                            wait = retry_after_seconds(resp)
+                    except (httpx.TransportError, httpx.TimeoutException) as e:
+                        if parts or isinstance(e, httpx.ReadTimeout):
+                            # the client already has part of the answer, or we already waited a full timeout
+                            call.failure()
+                            raise
+                        error = e
+                    if attempt < self.max_retries:
+                        await asyncio.sleep(wait if wait is not None else backoff_delay(attempt))
+                call.failure()
+                raise error
+
+    def stream_query(self, prompt: str, context: str = ""):
+        return self._stream(query_prompt(prompt, context), op="query")
+
+    def stream_summarize(self, text: str, max_length: int = 120):
+        return self._stream(summarize_prompt(text, max_length), op="summarize")
+
+    async def _batch(self, op: str, texts: list[str], max_length: int = 120) -> dict:
+        """
+        Run `op` over many texts with as few Gemini calls as possible. Items already
+        in the response cache (under the single-item key) are answered from it; the
+        rest are packed into budget-sized batches. Items missing or malformed in a
+        batch reply are split in half and retried; a single item that still fails
+        is reported with an error. A failed call (transport, HTTP, open circuit)
+        is not split: its items are reported with the error next to the results
+        that did come back. Only when nothing succeeded does an open circuit or a
+        full limiter propagate (503). Results are cached per item.
+        """
+        field = BATCH_FIELDS[op]
+        single_prompt = categorize_prompt if op == "categorize" else lambda t: summarize_prompt(t, max_length)
+        results = [None] * len(texts)
+        keys = {}
+        for i, text in enumerate(texts):
+            key, cached = self._cache_lookup(single_prompt(text), op)
+            keys[i] = key
+            if cached is not None:
+                results[i] = {"index": i, "ok": True, field: parse_tags(cached) if op == "categorize" else cached}
+        calls = 0
+        unavailable = None  # first CircuitOpenError / LimiterFull seen
+        gate = asyncio.Semaphore(AI_BATCH_CONCURRENCY)
+
+        async def run(indices: list[int]):
+            nonlocal calls, unavailable
+            async with gate:
+                calls += 1
+                try:
+                    data = await self._post({
+                        "contents": [{"parts": [{"text": batch_prompt(op, [texts[i] for i in indices], max_length)}]}],
+                        "generationConfig": {"responseMimeType": "application/json"},
+                    })
+                except Exception as e:
+                    # the call itself failed: splitting would only multiply calls against an outage
+                    if isinstance(e, (CircuitOpenError, LimiterFull)) and unavailable is None:
+                        unavailable = e
+                    for i in indices:
+                        results[i] = {"index": i, "ok": False, "error": str(e)}
+                    return
+            parsed = parse_batch_results(self._response_text(data, None), len(indices), field)
+            failed = []
+            for pos, i in enumerate(indices):
+                if pos not in parsed:
+                    failed.append(i)
+                    continue
+                value = parsed[pos]
+                results[i] = {"index": i, "ok": True, field: value}
+                if keys[i] is not None:
+                    self.cache.set(keys[i], ", ".join(value) if op == "categorize" else value)
+            if len(failed) == 1 and len(indices) == 1:
+                results[failed[0]] = {"index": failed[0], "ok": False, "error": "no result for this item"}
+            elif failed:
+                mid = (len(failed) + 1) // 2
+                await asyncio.gather(*(run(part) for part in (failed[:mid], failed[mid:]) if part))
+
+        todo = [i for i, r in enumerate(results) if r is None]
+        packed = pack_batches([texts[i] for i in todo])
+        await asyncio.gather(*(run([todo[j] for j in batch]) for batch in packed))
+        if unavailable is not None and not any(r["ok"] for r in results):
+            raise unavailable
+        return {"results": results, "calls": calls}
+
+    async def categorize_batch(self, texts: list[str]) -> dict:
+        return await self._batch("categorize", texts)
+
+    async def summarize_batch(self, texts: list[str], max_length: int = 120) -> dict:
+        return await self._batch("summarize", texts, max_length)
+
+    async def query(self, prompt: str, context: str = "") -> str:
+        return await self._call(query_prompt(prompt, context), op="query")
+
+    async def summarize(self, text: str, max_length: int = 120) -> str:
+        return await self._call(summarize_prompt(text, max_length), op="summarize")
+
+    async def categorize(self, text: str) -> list[str]:
+        return parse_tags(await self._call(categorize_prompt(text), op="categorize"))
 
+    async def query_voice(self, prompt: str) -> str:
+        return await self._call(prompt, op="voice")
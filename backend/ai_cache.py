@@ -0,0 +1,124 @@
+# backend/ai_cache.py
+"""
+Content-addressed cache for Gemini responses.
+
+Entries are keyed on sha256(model, operation, prompt). The first tier is an
+in-memory LRU with a TTL; set AI_CACHE_DB to a file path to add a persistent
+SQLite tier that survives restarts and is shared between worker processes.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+AI_CACHE_SIZE = int(os.getenv("AI_CACHE_SIZE", "1024"))  # in-memory entries
+AI_CACHE_TTL = int(os.getenv("AI_CACHE_TTL", "86400"))  # seconds
+AI_CACHE_DB = os.getenv("AI_CACHE_DB")  # e.g. ./ai_cache.db; unset = memory only
+# operations that must never be served from cache. Voice parsing resolves
+# "tomorrow at 6pm" against the current date, so the same text can't reuse an answer.
+AI_CACHE_DISABLE = {op.strip() for op in os.getenv("AI_CACHE_DISABLE", "voice").split(",") if op.strip()}
+
+
+def cache_key(model: str, op: str, prompt: str) -> str:
+    h = hashlib.sha256()
+    for part in (model, op, prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = AI_CACHE_SIZE, ttl: int = AI_CACHE_TTL, db_path: Optional[str] = AI_CACHE_DB):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._mem = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS ai_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._mem.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._mem[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM ai_cache WHERE key = ? AND expires_at > ?", (key, now)
+                ).fetchone()
+                if row is not None:
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str):
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._remember(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO ai_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at),
+                )
+                self._db.execute("DELETE FROM ai_cache WHERE expires_at <= ?", (time.time(),))
+                self._db.commit()
+
+    def _remember(self, key: str, value: str, expires_at: float):
+        self._mem[key] = (expires_at, value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM ai_cache")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._mem),
+                "persistent": self._db is not None,
+                "disabled_ops": sorted(AI_CACHE_DISABLE),
+            }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+def get_cache() -> ResponseCache:
+    """Process-wide cache shared by every GeminiWrapper."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+    return _cache
@@ -1,23 +1,68 @@
 # backend/app.py
-from fastapi import FastAPI, Depends, HTTPException, Query, UploadFile, File
+import time
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import List, Optional
 from datetime import datetime, timezone, timedelta
 
 import backend.models as models
 import backend.schemas as schemas
 import backend.crud as crud
-from backend.database import SessionLocal, engine, Base
+import backend.crud_async as crud_async
+from backend.database import SessionLocal, AsyncSessionLocal, dispose_async_engine, engine, Base, init_db
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+import json
 import pytz
+from backend import boot, versions
 
 IST = pytz.timezone("Asia/Kolkata")
 
 
-# Create tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy resources start here, not at import, and each can be switched off (see backend/boot.py)
+    with boot.component("migrations") as on:
+        if on:
+            # schema is managed by Alembic (backend/migrations)
+            init_db()
+    # the reminder worker reads the reminders table, so only start it once the schema exists
+    with boot.component("scheduler") as on:
+        if on:
+            from backend.scheduler import start_scheduler_if_needed
+            start_scheduler_if_needed()
+    with boot.component("tagging") as on:
+        if on:
+            from backend.tagging import start_tagging
+            start_tagging()
+    # spawn the whisper worker processes now so the first recording doesn't wait for model loading
+    with boot.component("stt") as on:
+        if on:
+            from backend.stt import get_pool
+            get_pool().start()
+    boot.log_report()
+
+    yield
+
+    # stop what startup started, in reverse order; the scheduler goes before the
+    # telegram dispatcher it sends through
+    from backend.stt import stop_pool
+    stop_pool()
+    from backend.tagging import stop_tagging
+    stop_tagging()
+    from backend.scheduler import stop_scheduler
+    stop_scheduler()
+    from backend.notifier import stop_dispatcher
+    stop_dispatcher()
+    await ai.close_async_client()
+    await dispose_async_engine()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # app = FastAPI(title="TaskAI - Daily Task & Notes Manager (backend)")
 
@@ -33,12 +78,15 @@ app.add_middleware(
 
 from . import models
 
-@app.on_event("startup")
-def startup_event():
-    models.Base.metadata.create_all(bind=engine)
+@app.get("/health/boot")
+def boot_report():
+    """Import and startup timings of this process, per phase."""
+    return boot.report()
 
 
 # Dependency to get DB session
+# Sync sessions are for handlers that run in the threadpool anyway (bulk writes,
+# export, retrieval); plain CRUD handlers are async and use get_async_db.
 def get_db():
     db = SessionLocal()
     try:
@@ -46,12 +94,16 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 
 
 
 @app.post("/tasks", response_model=schemas.TaskOut)
-def api_create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
-    db_task = crud.create_task(db, task)
+async def api_create_task(task: schemas.TaskCreate, db: AsyncSession = Depends(get_async_db)):
+    db_task = await crud_async.create_task(db, task)
 
     # Auto-create a reminder at the task's due_datetime (if present)
     try:
@@ -76,50 +128,197 @@ def api_create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
                 remind_at=remind_at,
                 advance_minutes=15
             )
-            crud.create_reminder(db, rem_schema)
+            await crud_async.create_reminder(db, rem_schema)
     except Exception as e:
         # don't fail task creation if reminder creation fails; log for debug
         print("Warning: failed to auto-create reminder:", e)
+        await db.rollback()
+
+    # with its reminders loaded: they can't be lazy-loaded during serialization
+    return await crud_async.get_task(db, db_task.id)
+
+PAGE_SIZE_DEFAULT = 50
+PAGE_SIZE_MAX = 200
+
+def not_modified(request: Request, response: Response, *collections: str) -> Optional[Response]:
+    """
+    Conditional GET: put the ETag for `collections` (and this query string) on
+    the response, or return a bodiless 304 when the client already has it.
+    Call before touching the database.
+    """
+    tag = versions.etag(*collections, variant=request.url.query)
+    headers = {"ETag": tag, "Cache-Control": "no-cache"}
+    if versions.matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+@app.get("/tasks", response_model=schemas.TaskPage)
+async def api_list_tasks(
+    request: Request,
+    response: Response,
+    filter_by: Optional[str] = Query(None, alias="filter"),
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # tasks embed their reminders
+    cached = not_modified(request, response, "tasks", "reminders")
+    if cached:
+        return cached
+    try:
+        items, next_cursor = await crud_async.list_tasks_page(db, filter_by=filter_by, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": items, "limit": limit, "next_cursor": next_cursor}
+
+# task fields a client may leave out of an update but not set to null
+# (priority is nullable in the table, but nothing downstream expects a NULL)
+TASK_NOT_NULL = ("title", "status", "priority")
+
+def null_fields(changes: dict) -> List[str]:
+    return [field for field in TASK_NOT_NULL if field in changes and changes[field] is None]
 
-    return db_task
+@app.post("/tasks/bulk", response_model=schemas.TaskBulkResult)
+def api_bulk_tasks(payload: schemas.TaskBulkRequest, db: Session = Depends(get_db)):
+    """
+    Create (no id) or update (with id) up to TASK_BULK_MAX tasks, plus their
+    auto-reminders, in one transaction. All or nothing: an unknown id is a 404.
+    """
+    problems = []
+    for i, item in enumerate(payload.tasks):
+        if item.id is None:
+            if item.title is None:
+                problems.append(f"tasks[{i}]: title is required to create a task")
+        else:
+            null = null_fields(item.dict(exclude_unset=True))
+            if null:
+                problems.append(f"tasks[{i}]: {', '.join(null)} cannot be null")
+    if problems:
+        raise HTTPException(status_code=422, detail=problems[:20])
+    try:
+        return crud.bulk_save_tasks(db, payload.tasks)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
 
-@app.get("/tasks", response_model=List[schemas.TaskOut])
-def api_list_tasks(filter_by: Optional[str] = Query(None, alias="filter"), db: Session = Depends(get_db)):
-    return crud.list_tasks(db, filter_by=filter_by)
+@app.post("/tasks/bulk-status", response_model=schemas.TaskStatusBulkResult)
+def api_bulk_task_status(payload: schemas.TaskStatusBulk, db: Session = Depends(get_db)):
+    """
+    Set the status of many tasks with one UPDATE; marking them done also cancels
+    their pending reminders. All or nothing: an unknown id is a 404.
+    """
+    try:
+        return crud.bulk_set_status(db, payload.ids, payload.status)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+@app.get("/tasks/export")
+def api_export_tasks(filter_by: Optional[str] = Query(None, alias="filter")):
+    """All tasks as NDJSON (one JSON object per line), streamed straight from a DB cursor."""
+    def lines():
+        # the request's get_db session is closed before the body streams; use our own
+        db = SessionLocal()
+        try:
+            buf = []
+            size = 0
+            for row in crud.iter_tasks_export(db, filter_by):
+                line = json.dumps(row, default=_json_default) + "\n"
+                buf.append(line)
+                size += len(line)
+                # each yield is a threadpool hop; send ~64KB at a time, not a line at a time
+                if size >= EXPORT_CHUNK_BYTES:
+                    yield "".join(buf)
+                    buf, size = [], 0
+            if buf:
+                yield "".join(buf)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="tasks.ndjson"'},
+    )
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
 
 @app.get("/tasks/{task_id}", response_model=schemas.TaskOut)
-def api_get_task(task_id: int, db: Session = Depends(get_db)):
-    t = crud.get_task(db, task_id)
+async def api_get_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    t = await crud_async.get_task(db, task_id)
     if not t:
         raise HTTPException(status_code=404, detail="Task not found")
     return t
 
 @app.put("/tasks/{task_id}", response_model=schemas.TaskOut)
-def api_update_task(task_id: int, changes: schemas.TaskUpdate, db: Session = Depends(get_db)):
-    t = crud.update_task(db, task_id, changes)
+async def api_update_task(task_id: int, changes: schemas.TaskUpdate, db: AsyncSession = Depends(get_async_db)):
+    null = null_fields(changes.dict(exclude_unset=True))
+    if null:
+        raise HTTPException(status_code=422, detail=f"{', '.join(null)} cannot be null")
+    t = await crud_async.update_task(db, task_id, changes)
+    if not t:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return t
+
+@app.patch("/tasks/{task_id}", response_model=schemas.TaskOut)
+async def api_patch_task(task_id: int, changes: schemas.TaskUpdate, db: AsyncSession = Depends(get_async_db)):
+    """Change only the fields sent, e.g. {"status": "done"}."""
+    null = null_fields(changes.dict(exclude_unset=True))
+    if null:
+        raise HTTPException(status_code=422, detail=f"{', '.join(null)} cannot be null")
+    t = await crud_async.patch_task(db, task_id, changes)
     if not t:
         raise HTTPException(status_code=404, detail="Task not found")
     return t
 
 @app.delete("/tasks/{task_id}")
-def api_delete_task(task_id: int, db: Session = Depends(get_db)):
-    ok = crud.delete_task(db, task_id)
+async def api_delete_task(task_id: int, db: AsyncSession = Depends(get_async_db)):
+    ok = await crud_async.delete_task(db, task_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Task not found")
     return {"ok": True}
 
 # Notes
 @app.post("/notes", response_model=schemas.NoteOut)
-def api_create_note(note: schemas.NoteCreate, db: Session = Depends(get_db)):
-    return crud.create_note(db, note)
-
-@app.get("/notes", response_model=List[schemas.NoteOut])
-def api_list_notes(db: Session = Depends(get_db)):
-    return crud.list_notes(db)
+async def api_create_note(note: schemas.NoteCreate, db: AsyncSession = Depends(get_async_db)):
+    return await crud_async.create_note(db, note)
+
+@app.get("/notes", response_model=schemas.NotePage)
+async def api_list_notes(
+    request: Request,
+    response: Response,
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    cached = not_modified(request, response, "notes")
+    if cached:
+        return cached
+    try:
+        items, next_cursor = await crud_async.list_notes_page(db, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"items": items, "limit": limit, "next_cursor": next_cursor}
+
+@app.get("/notes/tagging", response_model=schemas.TaggingJobs)
+def api_tagging_jobs(
+    include_failed: bool = False,
+    limit: int = Query(100, ge=1, le=PAGE_SIZE_MAX),
+    db: Session = Depends(get_db),
+):
+    """Notes still waiting for auto-tags (and, optionally, ones that gave up), plus queue counters."""
+    from backend.tagging import get_tagger
+    statuses = ["pending", "failed"] if include_failed else ["pending"]
+    jobs = crud.list_notes_by_tagging_status(db, statuses, limit=limit)
+    return {"stats": get_tagger().snapshot(), "jobs": jobs}
 
 @app.delete("/notes/{note_id}")
-def api_delete_note(note_id: int, db: Session = Depends(get_db)):
-    ok = crud.delete_note(db, note_id)
+async def api_delete_note(note_id: int, db: AsyncSession = Depends(get_async_db)):
+    ok = await crud_async.delete_note(db, note_id)
     if not ok:
         raise HTTPException(status_code=404, detail="Note not found")
     return {"message": "Note deleted successfully"}
@@ -127,61 +326,146 @@ def api_delete_note(note_id: int, db: Session = Depends(get_db)):
 
 # Reminders
 @app.post("/reminders", response_model=schemas.ReminderOut)
-def api_create_reminder(rem: schemas.ReminderCreate, db: Session = Depends(get_db)):
+async def api_create_reminder(rem: schemas.ReminderCreate, db: AsyncSession = Depends(get_async_db)):
     # Validate task exists
-    t = crud.get_task(db, rem.task_id)
+    t = await db.get(models.Task, rem.task_id)
     if not t:
         raise HTTPException(status_code=404, detail="Task not found for reminder")
-    return crud.create_reminder(db, rem)
+    return await crud_async.create_reminder(db, rem)
 
 @app.get("/reminders", response_model=List[schemas.ReminderOut])
-def api_list_reminders(db: Session = Depends(get_db)):
-    # return db.query(models.Reminder).all()
-    now = datetime.now(timezone.utc)
-    return db.query(models.Reminder).filter(models.Reminder.notified == False).all()
+async def api_list_reminders(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    cached = not_modified(request, response, "reminders")
+    if cached:
+        return cached
+    return await crud_async.list_pending_reminders(db)
+
+# Dashboard
+@app.get("/dashboard", response_model=schemas.Dashboard)
+async def api_dashboard(
+    request: Request,
+    response: Response,
+    filter_by: Optional[str] = Query(None, alias="filter"),
+    limit: int = Query(PAGE_SIZE_DEFAULT, ge=1, le=PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    The Tasks tab in one round trip: the same page as GET /tasks, pending
+    reminders with their task titles, and note counts. Fixed query count.
+    """
+    cached = not_modified(request, response, "tasks", "reminders", "notes")
+    if cached:
+        return cached
+    try:
+        return await crud_async.get_dashboard(db, filter_by=filter_by, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
 
 
 from fastapi import FastAPI, Depends
 from sqlalchemy.orm import Session
-from backend import ai, crud, database, schemas
-from backend.ai import GeminiWrapper 
+import json
+from backend import ai, crud, database, schemas, retrieval, voice_parser
+from backend.ai import AsyncGeminiWrapper
+from backend.http_client import CircuitOpenError
+from backend.limiter import LimiterFull
+from starlette.concurrency import run_in_threadpool
 
 # app = FastAPI()
 
 # Create a single Ollama AI instance
 # ai_wrapper = ai.AIWrapper(model="llama3", host="http://localhost:11434")
-ai_wrapper = GeminiWrapper(model="gemini-2.0-flash")
+# async: AI handlers await Gemini on the event loop instead of blocking a threadpool thread
+ai_wrapper = AsyncGeminiWrapper(model="gemini-2.0-flash")
+
+@app.exception_handler(CircuitOpenError)
+def ai_unavailable_handler(request, exc: CircuitOpenError):
+    # Gemini circuit is open: fail fast instead of holding the request for the full timeout
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(int(exc.retry_after))},
+    )
+
+@app.exception_handler(LimiterFull)
+def ai_busy_handler(request, exc: LimiterFull):
+    # too many AI calls already waiting: shed load rather than queue unboundedly
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
 
 @app.post("/ai/query")
-def ai_query(payload: schemas.AIQuery, db: Session = Depends(get_db)):
+async def ai_query(payload: schemas.AIQuery, db: Session = Depends(get_db)):
     context = payload.context
     if not context:
-        # Auto-inject tasks and notes
-        tasks = crud.list_tasks(db)
-        notes = crud.list_notes(db)
-        context_parts = []
-        for t in tasks:
-            context_parts.append(f"- Task: {t.title} | Status: {t.status} | Due: {t.due_datetime}")
-        for n in notes:
-            context_parts.append(f"- Note: {n.title} | {n.content[:100]}...")
-        context = "\n".join(context_parts) if context_parts else "No tasks or notes available."
-
-    return {"answer": ai_wrapper.query(prompt=payload.prompt, context=context)}
+        # Auto-inject the tasks and notes most relevant to the question (BM25, size-capped)
+        context = await run_in_threadpool(retrieval.build_context, db, payload.prompt)
+
+    return {"answer": await ai_wrapper.query(prompt=payload.prompt, context=context)}
+
+@app.get("/ai/cache/stats")
+def ai_cache_stats():
+    return {
+        **ai_wrapper.cache.stats(),
+        "circuit": ai_wrapper.breaker.stats(),
+        "limiter": ai_wrapper.limiter.stats(),
+    }
 
 @app.post("/ai/summarize")
-def ai_summarize(payload: schemas.AISummaryRequest):
-    return {"summary": ai_wrapper.summarize(payload.text, max_length=payload.max_length)}
+async def ai_summarize(payload: schemas.AISummaryRequest):
+    return {"summary": await ai_wrapper.summarize(payload.text, max_length=payload.max_length)}
+
+async def sse_response(chunks) -> StreamingResponse:
+    """
+    Server-Sent Events: one `data:` event per text chunk (JSON-encoded string),
+    then `event: done`. The first chunk is awaited before the response starts, so
+    breaker/limiter/upstream errors still become normal HTTP errors.
+    """
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = None
+
+    async def events():
+        if first is not None:
+            yield f"data: {json.dumps(first)}\n\n"
+        try:
+            async for chunk in chunks:
+                yield f"data: {json.dumps(chunk)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps(str(e))}\n\n"
+            return
+        yield "event: done\ndata: \n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.post("/ai/query/stream")
+async def ai_query_stream(payload: schemas.AIQuery, db: Session = Depends(get_db)):
+    context = payload.context
+    if not context:
+        context = await run_in_threadpool(retrieval.build_context, db, payload.prompt)
+    return await sse_response(ai_wrapper.stream_query(prompt=payload.prompt, context=context))
+
+@app.post("/ai/summarize/stream")
+async def ai_summarize_stream(payload: schemas.AISummaryRequest):
+    return await sse_response(ai_wrapper.stream_summarize(payload.text, max_length=payload.max_length))
 
 @app.post("/ai/categorize")
-def ai_categorize(payload: schemas.AISummaryRequest):
-    return {"categories": ai_wrapper.categorize(payload.text)}
+async def ai_categorize(payload: schemas.AISummaryRequest):
+    return {"categories": await ai_wrapper.categorize(payload.text)}
+
+@app.post("/ai/categorize/batch", response_model=schemas.AIBatchResponse, response_model_exclude_none=True)
+async def ai_categorize_batch(payload: schemas.AIBatchRequest):
+    return await ai_wrapper.categorize_batch(payload.texts)
+
+@app.post("/ai/summarize/batch", response_model=schemas.AIBatchResponse, response_model_exclude_none=True)
+async def ai_summarize_batch(payload: schemas.AIBatchRequest):
+    return await ai_wrapper.summarize_batch(payload.texts, max_length=payload.max_length)
 
 
 
 from fastapi import Body, HTTPException, Depends
 from sqlalchemy.orm import Session
-from dateparser import parse as dateparse
 from datetime import datetime
 import pytz, json
 import os
@@ -196,8 +480,10 @@ def extract_task_from_gemini(resp):
     """Extract clean JSON dict from Gemini response safely"""
     raw_text = ""
 
-    # 1. Extract from candidates
-    if hasattr(resp, "candidates") and resp.candidates:
+    # 1. Extract from candidates (our wrappers already return the text)
+    if isinstance(resp, str):
+        raw_text = resp.strip()
+    elif hasattr(resp, "candidates") and resp.candidates:
         parts = resp.candidates[0].content.parts
         raw_text = "".join(
             p.text for p in parts if hasattr(p, "text")
@@ -217,23 +503,55 @@ def extract_task_from_gemini(resp):
         return {}
 
 
-gemini = GeminiWrapper(model="gemini-2.0-flash")
+gemini = ai_wrapper  # one client config for the voice parser and the /ai endpoints
+
+
+async def _save_voice_task(db: AsyncSession, task_details: dict):
+    """Create the task and its auto-reminder; returns (task, reminder or None)."""
+    task_data = schemas.TaskCreate(**task_details)
+    db_task = await crud_async.create_task(db, task_data)
+
+    # Auto-create reminder
+    reminder = None
+    if db_task.due_datetime:
+        remind_at = db_task.due_datetime
+        if remind_at.tzinfo is None:
+            remind_at = IST.localize(remind_at)
+        rem_schema = schemas.ReminderCreate(task_id=db_task.id, remind_at=remind_at)
+        reminder = await crud_async.create_reminder(db, rem_schema)
+    # reload with reminders so the response doesn't lazy-load on the event loop
+    return await crud_async.get_task(db, db_task.id), reminder
+
 
 @app.post("/tasks/voice")
-def api_create_task_voice(payload: dict = Body(...), db: Session = Depends(get_db)):
+async def api_create_task_voice(payload: dict = Body(...), db: AsyncSession = Depends(get_async_db)):
     """
     Accepts natural language like 'remind me to call Ravi tomorrow at 6pm'
-    Uses Gemini to extract structured task details (title, description, due_datetime, priority, tags).
-    Fallback to dateparser if needed.
+    The local parser handles the common shapes; Gemini only sees utterances it isn't sure about.
     """
     text = payload.get("text", "")
     if not text:
         raise HTTPException(status_code=400, detail="No text provided")
 
-    task_details = None
-    due_dt = None
+    task_details, _ = await _extract_voice_task(text)
 
-    # --- Step 1: Try Gemini structured extraction ---
+    # --- Step 3: Save task and reminder ---
+    await _save_voice_task(db, task_details)
+    return schemas.TaskCreate(**task_details)
+
+
+async def _extract_voice_task(text: str):
+    """
+    (task fields, parser) for an utterance: title, description, due_datetime,
+    priority, tags. parser is "local" when the deterministic parser was confident
+    enough, "gemini" when it had to ask, "local-fallback" when Gemini failed.
+    """
+    # --- Step 1: local parser (may touch dateparser, so off the event loop) ---
+    local, confidence = await run_in_threadpool(voice_parser.parse_voice, text)
+    if confidence >= voice_parser.VOICE_PARSE_THRESHOLD:
+        return local, "local"
+
+    # --- Step 2: Gemini structured extraction ---
     try:
         prompt = f"""
         You are a task manager assistant.
@@ -256,80 +574,117 @@ def api_create_task_voice(payload: dict = Body(...), db: Session = Depends(get_d
         - Title must be short and clear.
         """
 
-        resp = gemini.query(prompt)
+        # voice op: never cached, "tomorrow" depends on today's date
+        resp = await gemini.query_voice(prompt)
         parsed = extract_task_from_gemini(resp)
-        # print(parsed)
-
-        
+        if not parsed:
+            return local, "local-fallback"
 
         task_details = {
-            "title": parsed.get("title") or text,
+            "title": parsed.get("title") or local["title"],
             "description": parsed.get("description") or "Created via voice",
             "due_datetime": parsed.get("due_datetime"),
-            "priority": parsed.get("priority", 2),
+            "priority": parsed.get("priority", local["priority"]),
             "tags": parsed.get("tags") or "voice"
         }
 
         if task_details["due_datetime"]:
             dt = datetime.strptime(task_details["due_datetime"], "%Y-%m-%dT%H:%M")
-            due_dt = IST.localize(dt)
-            task_details["due_datetime"] = due_dt.isoformat()
+            task_details["due_datetime"] = IST.localize(dt).isoformat()
+        else:
+            # Gemini saw no date; keep whatever the local parser did find
+            task_details["due_datetime"] = local["due_datetime"]
+        return task_details, "gemini"
 
     except Exception as e:
         print("⚠️ Gemini parsing failed:", e)
+        return local, "local-fallback"
 
-    # --- Step 2: Fallback to dateparser ---
-    if not task_details or not task_details.get("due_datetime"):
-        due_dt = dateparse(text, settings={"TIMEZONE": "Asia/Kolkata", "RETURN_AS_TIMEZONE_AWARE": True})
-        task_details = {
-            "title": text,
-            "description": "Created via voice",
-            "due_datetime": due_dt.isoformat() if due_dt else None,
-            "priority": 2,
-            "tags": "voice"
-        }
-
-    # --- Step 3: Save Task ---
-    task_data = schemas.TaskCreate(**task_details)
-    db_task = crud.create_task(db, task_data)
-
-    # --- Step 4: Auto-create reminder ---
-    if db_task.due_datetime:
-        remind_at = db_task.due_datetime
-        if remind_at.tzinfo is None:
-            remind_at = IST.localize(remind_at)
-        rem_schema = schemas.ReminderCreate(task_id=db_task.id, remind_at=remind_at)
-        crud.create_reminder(db, rem_schema)
-
-    print("task_data in api_create_task", task_data)
-    print(type(task_data))
-
-    return task_data
-
-from faster_whisper import WhisperModel
-import tempfile
-
-# Load model once
-model = WhisperModel("small", device="cpu", compute_type="int8")
+from backend import stt
 
-@app.post("/stt")
-async def speech_to_text(file: UploadFile = File(...)):
+async def _read_audio(request: Request) -> bytes:
+    """
+    The recording as the raw request body (Content-Type: audio/wav, webm, ...),
+    read in memory up to STT_MAX_UPLOAD_BYTES. A multipart upload with a `file`
+    field is still accepted for older clients, parsed as it streams in under the
+    same cap (not via request.form(), which spools uploads to disk uncapped).
+    """
     try:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp:
-            tmp.write(await file.read())
-            tmp_path = tmp.name
-
-        # Transcribe audio
-        segments, _ = model.transcribe(tmp_path)
-        text = " ".join([segment.text for segment in segments])
-
-        return {"text": text.strip()}
+        stt.check_content_length(request.headers)
+        if request.headers.get("content-type", "").startswith("multipart/form-data"):
+            data = await stt.read_multipart_file(request, "file")
+            if data is None:
+                raise HTTPException(status_code=422, detail="Missing audio file")
+        else:
+            data = await stt.read_body(request)
+    except stt.UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:  # malformed multipart
+        raise HTTPException(status_code=400, detail=str(e))
+    if not data:
+        raise HTTPException(status_code=400, detail="Empty audio upload")
+    return data
+
+async def _transcribe(data: bytes, vad: bool = False) -> dict:
+    if not boot.enabled("stt"):
+        raise HTTPException(status_code=503, detail="Speech-to-text is disabled on this server")
+    try:
+        return await stt.get_pool().transcribe(data, vad=vad)
+    except stt.STTTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except LimiterFull:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/stt")
+async def speech_to_text(request: Request):
+    """Audio in, text out; decoded in memory without a temp file (see _read_audio)."""
+    result = await _transcribe(await _read_audio(request))
+    return {"text": result["text"]}
 
-
-# at bottom of backend/app.py (after ai wrapper creation)
-from backend.scheduler import start_scheduler_if_needed
-start_scheduler_if_needed()
+@app.post("/tasks/voice/audio", response_model=schemas.VoiceTaskResult)
+async def api_create_task_voice_audio(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    One round trip from recording to task: trim silence (VAD), transcribe,
+    extract the task fields, save the task and its reminder. Same body as /stt.
+    """
+    started = time.perf_counter()
+    data = await _read_audio(request)
+    read_done = time.perf_counter()
+    result = await _transcribe(data, vad=True)
+    stt_done = time.perf_counter()
+    if not result["text"]:
+        raise HTTPException(status_code=422, detail="No speech detected")
+
+    task_details, parser = await _extract_voice_task(result["text"])
+    extract_done = time.perf_counter()
+    task, reminder = await _save_voice_task(db, task_details)
+    saved = time.perf_counter()
+
+    ms = lambda seconds: round(seconds * 1000, 1)
+    return {
+        "text": result["text"],
+        "task": task,
+        "reminder": reminder,
+        "parser": parser,
+        "audio_seconds": round(result["audio_seconds"], 2),
+        "speech_seconds": round(result["speech_seconds"], 2),
+        "timings_ms": {
+            "read": ms(read_done - started),
+            "queue_wait": ms(result["queue_wait"]),
+            "decode": ms(result["decode_seconds"]),
+            "vad": ms(result["vad_seconds"]),
+            "transcribe": ms(result["transcribe_seconds"]),
+            "extract": ms(extract_done - stt_done),
+            "save": ms(saved - extract_done),
+            "total": ms(saved - started),
+        },
+    }
+
+@app.get("/stt/stats")
+def stt_stats():
+    return stt.get_pool().snapshot()
+
+
+boot.record("import backend.app", time.perf_counter() - _import_started)
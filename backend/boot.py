@@ -0,0 +1,71 @@
+# backend/boot.py
+"""
+Component toggles and a boot-time report.
+
+Every background component the API starts can be switched off per process
+with an env var (ENABLE_<NAME>=0), e.g. to run one process that owns the
+scheduler and tagging queue and several that only serve requests, or to
+import the app in a script without side effects:
+
+    RUN_MIGRATIONS      alembic upgrade head at startup
+    ENABLE_SCHEDULER    reminder worker thread
+    ENABLE_TAGGING      background note-tagging workers
+    ENABLE_STT          Whisper worker processes (/stt answers 503 when off)
+
+Import and startup phases are timed so GET /health/boot (and the log line at
+the end of startup) show where boot time goes.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import List
+
+_FALSE = {"0", "false", "no", "off"}
+
+_phases: List[dict] = []
+
+
+def enabled(name: str) -> bool:
+    """ENABLE_<NAME> (RUN_MIGRATIONS for migrations), on unless set to 0/false/no/off."""
+    var = "RUN_MIGRATIONS" if name == "migrations" else f"ENABLE_{name.upper()}"
+    return os.getenv(var, "1").strip().lower() not in _FALSE
+
+
+def record(name: str, seconds: float, status: str = "ok"):
+    _phases.append({"phase": name, "ms": round(seconds * 1000, 1), "status": status})
+
+
+@contextmanager
+def phase(name: str):
+    """Time a boot step; a failing step is recorded and re-raised."""
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except BaseException:
+        status = "failed"
+        raise
+    finally:
+        record(name, time.perf_counter() - started, status)
+
+
+@contextmanager
+def component(name: str):
+    """Like phase(), but yields False (and records "disabled") when the component is toggled off."""
+    if not enabled(name):
+        record(name, 0.0, "disabled")
+        yield False
+        return
+    with phase(name):
+        yield True
+
+
+def report() -> dict:
+    return {"phases": list(_phases), "total_ms": round(sum(p["ms"] for p in _phases), 1)}
+
+
+def log_report():
+    parts = ", ".join(
+        f"{p['phase']}={p['ms']:.0f}ms" + ("" if p["status"] == "ok" else f" ({p['status']})") for p in _phases
+    )
+    print(f"[boot] {parts}; total {report()['total_ms']:.0f}ms")
@@ -1,17 +1,42 @@
 # backend/crud.py
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime, timezone
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session, selectinload
+from typing import Iterator, List, Optional
+from datetime import datetime, timedelta, timezone
 
 import pytz
 IST = pytz.timezone("Asia/Kolkata")
 
 import backend.models as models
 import backend.schemas as schemas
+from backend.pagination import encode_cursor, decode_cursor, keyset_after, nulls_sort_low
 
 
-import backend.models as models
-import backend.ai as ai_wrapper  # import AI wrapper
+
+# WRITE HOOKS
+# Listeners are called as listener(event, obj_id, obj) after a write is committed,
+# e.g. ("reminder_created", 12, <Reminder>) or ("reminder_deleted", 12, None).
+# Events: task_created/updated/deleted, note_created/updated/deleted, reminder_created/updated/deleted.
+# The scheduler uses them to wake up when the reminder schedule changes, the
+# retrieval index to stay current, the tagging queue to pick up new notes, and
+# backend/versions.py to advance the ETags of the list endpoints.
+_listeners = []
+
+def add_listener(listener):
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+def _emit(event: str, obj_id: int, obj=None):
+    for listener in list(_listeners):
+        try:
+            listener(event, obj_id, obj)
+        except Exception as e:
+            # a broken listener must never fail the write itself
+            print(f"[crud] listener error on {event}: {e}")
 
 # TASKS
 def create_task(db: Session, task: schemas.TaskCreate) -> models.Task:
@@ -25,21 +50,53 @@ def create_task(db: Session, task: schemas.TaskCreate) -> models.Task:
     db.add(db_task)
     db.commit()
     db.refresh(db_task)
+    _emit("task_created", db_task.id, db_task)
     return db_task
 
 def get_task(db: Session, task_id: int) -> Optional[models.Task]:
-    return db.query(models.Task).filter(models.Task.id == task_id).first()
+    return (
+        db.query(models.Task)
+        .options(selectinload(models.Task.reminders))
+        .filter(models.Task.id == task_id)
+        .first()
+    )
 
-def list_tasks(db: Session, filter_by: Optional[str] = None) -> List[models.Task]:
-    q = db.query(models.Task)
-    # return q
+def _task_filters(filter_by: Optional[str] = None) -> list:
     if filter_by == "today":
         start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
         end = start.replace(hour=23, minute=59, second=59)
-        q = q.filter(models.Task.due_datetime >= start, models.Task.due_datetime <= end)
-    elif filter_by == "overdue":
-        q = q.filter(models.Task.due_datetime != None, models.Task.due_datetime < datetime.utcnow(), models.Task.status != "done")
-    return q.order_by(models.Task.priority.asc(), models.Task.due_datetime.asc()).all()
+        return [models.Task.due_datetime >= start, models.Task.due_datetime <= end]
+    if filter_by == "overdue":
+        return [models.Task.due_datetime != None, models.Task.due_datetime < datetime.utcnow(), models.Task.status != "done"]
+    return []
+
+def _filtered_tasks(db: Session, filter_by: Optional[str] = None):
+    # TaskOut serializes reminders; load them for the whole result in one IN query
+    # instead of one lazy SELECT per task
+    return db.query(models.Task).options(selectinload(models.Task.reminders)).filter(*_task_filters(filter_by))
+
+# (column, descending) — matches ix_tasks_priority_due_datetime_id
+TASK_ORDER = [(models.Task.priority, False), (models.Task.due_datetime, False), (models.Task.id, False)]
+
+def list_tasks(db: Session, filter_by: Optional[str] = None) -> List[models.Task]:
+    q = _filtered_tasks(db, filter_by)
+    return q.order_by(models.Task.priority.asc(), models.Task.due_datetime.asc(), models.Task.id.asc()).all()
+
+def list_tasks_page(db: Session, filter_by: Optional[str] = None, limit: int = 50, cursor: Optional[str] = None):
+    """
+    One page of list_tasks in (priority, due_datetime, id) order.
+    Returns (tasks, next_cursor); next_cursor is None on the last page.
+    Raises ValueError for a malformed cursor.
+    """
+    q = _filtered_tasks(db, filter_by)
+    if cursor:
+        values = decode_cursor(cursor, len(TASK_ORDER))
+        q = q.filter(keyset_after(TASK_ORDER, values, nulls_sort_low(db.bind.dialect.name)))
+    rows = q.order_by(models.Task.priority.asc(), models.Task.due_datetime.asc(), models.Task.id.asc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor([last.priority, last.due_datetime, last.id])
 
 def update_task(db: Session, task_id: int, changes: schemas.TaskUpdate) -> Optional[models.Task]:
     db_task = get_task(db, task_id)
@@ -49,6 +106,7 @@ def update_task(db: Session, task_id: int, changes: schemas.TaskUpdate) -> Optio
         setattr(db_task, field, value)
     db.commit()
     db.refresh(db_task)
+    _emit("task_updated", db_task.id, db_task)
     return db_task
 
 def delete_task(db: Session, task_id: int) -> bool:
@@ -57,21 +115,216 @@ def delete_task(db: Session, task_id: int) -> bool:
         return False
     db.delete(db_task)
     db.commit()
+    _emit("task_deleted", task_id)
     return True
 
+# BULK
+TASK_EXPORT_COLUMNS = [
+    models.Task.id, models.Task.title, models.Task.description, models.Task.due_datetime, models.Task.status,
+    models.Task.priority, models.Task.tags, models.Task.created_at, models.Task.updated_at,
+]
+
+def _reminder_time(due: datetime, advance: timedelta) -> datetime:
+    # same rule as create_reminder: naive means IST
+    due = IST.localize(due) if due.tzinfo is None else due.astimezone(IST)
+    return due - advance
+
+def bulk_save_tasks(db: Session, items: List[schemas.TaskBulkItem], reminder_advance: timedelta = timedelta(minutes=15)) -> dict:
+    """
+    Insert items without an id and update items with one, in a single transaction
+    and a handful of executemany statements regardless of the item count:
+    one INSERT ... RETURNING for new tasks, one UPDATE per distinct set of changed
+    fields, and one INSERT for the auto-reminders (due - reminder_advance).
+    An update that sets due_datetime replaces the task's pending reminders; one
+    that sets status "done" cancels them, and done tasks get no auto-reminder.
+    Raises LookupError (and writes nothing) if an id doesn't exist.
+    Returns {"created": [ids], "updated": [ids], "reminders": n, "reminders_cancelled": n}.
+    """
+    new = [item for item in items if item.id is None]
+    changed = [item for item in items if item.id is not None]
+    rows = [
+        {
+            "title": item.title,
+            "description": item.description,
+            "due_datetime": item.due_datetime,
+            "status": item.status or "pending",
+            "priority": item.priority or 2,
+            "tags": item.tags or "",
+        }
+        for item in new
+    ]
+    changes = [{"id": item.id, **item.dict(exclude_unset=True)} for item in changed]
+    try:
+        # Core inserts on the tables: ORM bulk INSERT falls back to a statement per
+        # row when some values are None. RETURNING whole rows instead of ids because
+        # matching ids back to inputs needs sort_by_parameter_order, which SQLite
+        # can also only honour one row at a time.
+        created = []
+        if rows:
+            created = [dict(r) for r in db.execute(insert(models.Task.__table__).returning(*TASK_EXPORT_COLUMNS), rows).mappings()]
+
+        updated_ids, replaced, cancelled = [c["id"] for c in changes], [], []
+        finished = {c["id"] for c in changes if c.get("status") == "done"}
+        if changes:
+            found = set(db.scalars(select(models.Task.id).where(models.Task.id.in_(updated_ids))))
+            missing = sorted(set(updated_ids) - found)
+            if missing:
+                raise LookupError(f"Tasks not found: {missing[:20]}")
+            db.execute(update(models.Task), changes)
+            # a new due date supersedes the reminders derived from the old one
+            rescheduled = [c["id"] for c in changes if "due_datetime" in c and c["id"] not in finished]
+            if rescheduled:
+                replaced = list(db.scalars(select(models.Reminder.id).where(
+                    models.Reminder.task_id.in_(rescheduled), models.Reminder.notified == False
+                )))
+                if replaced:
+                    db.query(models.Reminder).filter(models.Reminder.id.in_(replaced)).delete(synchronize_session=False)
+            # same rule as PATCH and bulk_set_status: a done task has nothing left to remind
+            if finished:
+                cancelled = list(db.scalars(cancel_pending_reminders(sorted(finished))))
+
+        due = [(row["id"], row["due_datetime"]) for row in created if row["status"] != "done"]
+        due += [(c["id"], c["due_datetime"]) for c in changes if "due_datetime" in c and c["id"] not in finished]
+        reminder_rows = [
+            {"task_id": tid, "remind_at": _reminder_time(at, reminder_advance), "notified": False}
+            for tid, at in due if at is not None
+        ]
+        reminders = []
+        if reminder_rows:
+            reminders = list(db.execute(
+                insert(models.Reminder.__table__).returning(models.Reminder.id, models.Reminder.task_id, models.Reminder.remind_at),
+                reminder_rows,
+            ).mappings())
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+
+    # hooks see detached copies of the new rows; updated tasks are re-read in one query
+    for row in created:
+        _emit("task_created", row["id"], models.Task(**row))
+    if updated_ids:
+        for task in db.query(models.Task).filter(models.Task.id.in_(updated_ids)):
+            _emit("task_updated", task.id, task)
+    for rid in replaced + cancelled:
+        _emit("reminder_deleted", rid)
+    for row in reminders:
+        _emit("reminder_created", row["id"], models.Reminder(notified=False, **row))
+    return {
+        "created": sorted(row["id"] for row in created),
+        "updated": updated_ids,
+        "reminders": len(reminders),
+        "reminders_cancelled": len(cancelled),
+    }
+
+def cancel_pending_reminders(task_ids: List[int]):
+    """DELETE ... RETURNING id for the pending reminders of task_ids: a done task has nothing left to remind."""
+    return (
+        delete(models.Reminder.__table__)
+        .where(models.Reminder.task_id.in_(task_ids), models.Reminder.notified == False)
+        .returning(models.Reminder.id)
+    )
+
+def bulk_set_status(db: Session, task_ids: List[int], status: str = "done") -> dict:
+    """
+    Set `status` on every task in task_ids with one UPDATE ... WHERE id IN (...)
+    and, when marking done, delete their pending reminders with one DELETE, in
+    the same transaction. Nothing is loaded into the session first.
+    Raises LookupError (and writes nothing) if an id doesn't exist.
+    Returns {"updated": [ids], "reminders_cancelled": n}.
+    """
+    ids = sorted(set(task_ids))
+    try:
+        rows = [dict(r) for r in db.execute(
+            update(models.Task.__table__)
+            .where(models.Task.id.in_(ids))
+            .values(status=status)
+            .returning(*TASK_EXPORT_COLUMNS)
+        ).mappings()]
+        missing = sorted(set(ids) - {row["id"] for row in rows})
+        if missing:
+            raise LookupError(f"Tasks not found: {missing[:20]}")
+        cancelled = list(db.scalars(cancel_pending_reminders(ids))) if status == "done" else []
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+
+    for row in rows:
+        _emit("task_updated", row["id"], models.Task(**row))
+    for rid in cancelled:
+        _emit("reminder_deleted", rid)
+    return {"updated": ids, "reminders_cancelled": len(cancelled)}
+
+def iter_tasks_export(db: Session, filter_by: Optional[str] = None, batch_size: int = 1000) -> Iterator[dict]:
+    """
+    Every task (optionally filtered like list_tasks) as a plain dict, in id order.
+    Rows come from a server-side cursor batch_size at a time, so memory stays flat
+    however large the table is; the session must stay open while iterating.
+    """
+    stmt = (
+        select(*TASK_EXPORT_COLUMNS)
+        .where(*_task_filters(filter_by))
+        .order_by(models.Task.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in db.execute(stmt).mappings():
+        yield dict(row)
+
 # NOTES
 def create_note(db: Session, note: schemas.NoteCreate) -> models.Note:
-    # Call AI categorizer
-    tags_list = ai_wrapper.categorize(note.content)
-    tags_str = ", ".join(tags_list)
-    db_note = models.Note(title=note.title, content=note.content, tags=tags_str)
+    # tags are filled in by the background tagging queue (backend/tagging.py)
+    db_note = models.Note(title=note.title, content=note.content, tags="", tagging_status="pending")
     db.add(db_note)
     db.commit()
     db.refresh(db_note)
+    _emit("note_created", db_note.id, db_note)
     return db_note
 
+# newest first. By id alone: ids follow insertion order, and a created_at key
+# can't round-trip through a cursor on SQLite (stored as "YYYY-MM-DD HH:MM:SS",
+# bound back as "...:SS.000000", so the cursor row compared as "after" itself).
+NOTE_ORDER = [(models.Note.id, True)]
+
 def list_notes(db: Session) -> List[models.Note]:
-    return db.query(models.Note).order_by(models.Note.created_at.desc()).all()
+    return db.query(models.Note).order_by(models.Note.id.desc()).all()
+
+def list_notes_page(db: Session, limit: int = 50, cursor: Optional[str] = None):
+    """Like list_tasks_page, for notes newest first."""
+    q = db.query(models.Note)
+    if cursor:
+        values = decode_cursor(cursor, len(NOTE_ORDER))
+        q = q.filter(keyset_after(NOTE_ORDER, values, nulls_sort_low(db.bind.dialect.name)))
+    rows = q.order_by(models.Note.id.desc()).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor([last.id])
+
+def get_note(db: Session, note_id: int) -> Optional[models.Note]:
+    return db.query(models.Note).filter(models.Note.id == note_id).first()
+
+def set_note_tags(db: Session, note_id: int, tags: str, status: str = "done") -> Optional[models.Note]:
+    note = get_note(db, note_id)
+    if not note:
+        return None
+    note.tags = tags
+    note.tagging_status = status
+    db.commit()
+    db.refresh(note)
+    _emit("note_updated", note.id, note)
+    return note
+
+def list_notes_by_tagging_status(db: Session, statuses: List[str], limit: Optional[int] = None) -> List[models.Note]:
+    """Notes whose tagging_status is one of `statuses`, oldest first."""
+    q = (
+        db.query(models.Note)
+        .filter(models.Note.tagging_status.in_(statuses))
+        .order_by(models.Note.created_at, models.Note.id)
+    )
+    if limit is not None:
+        q = q.limit(limit)
+    return q.all()
 
 def delete_note(db: Session, note_id: int) -> bool:
     note = db.query(models.Note).filter(models.Note.id == note_id).first()
@@ -79,6 +332,7 @@ def delete_note(db: Session, note_id: int) -> bool:
         return False
     db.delete(note)
     db.commit()
+    _emit("note_deleted", note_id)
     return True
 
 
@@ -101,22 +355,63 @@ def create_reminder(db: Session, rem: schemas.ReminderCreate) -> models.Reminder
     db.add(db_rem)
     db.commit()
     db.refresh(db_rem)
+    _emit("reminder_created", db_rem.id, db_rem)
     return db_rem
 
 def get_due_reminders(db: Session, now: datetime) -> List[models.Reminder]:
     return db.query(models.Reminder).filter(models.Reminder.remind_at <= now, models.Reminder.notified == False).all()
 
+def get_due_reminders_with_titles(db: Session, now: datetime, limit: Optional[int] = None):
+    """
+    Due reminders joined with their task title in one query.
+    Returns rows of (id, task_id, remind_at, title); title is None for orphaned reminders.
+    """
+    q = (
+        db.query(models.Reminder.id, models.Reminder.task_id, models.Reminder.remind_at, models.Task.title)
+        .outerjoin(models.Task, models.Task.id == models.Reminder.task_id)
+        .filter(models.Reminder.remind_at <= now, models.Reminder.notified == False)
+        .order_by(models.Reminder.remind_at.asc(), models.Reminder.id.asc())
+    )
+    if limit:
+        q = q.limit(limit)
+    return q.all()
+
+def list_pending_reminders(db: Session) -> List[models.Reminder]:
+    """All reminders that have not fired yet, soonest first."""
+    return (
+        db.query(models.Reminder)
+        .filter(models.Reminder.notified == False)
+        .order_by(models.Reminder.remind_at.asc())
+        .all()
+    )
+
 def mark_reminder_notified(db: Session, reminder_id: int):
     r = db.query(models.Reminder).filter(models.Reminder.id == reminder_id).first()
     if r:
         r.notified = True
         db.commit()
         db.refresh(r)
+        _emit("reminder_updated", r.id, r)
 
 def delete_reminder(db: Session, reminder_id: int):
     rem = db.query(models.Reminder).filter(models.Reminder.id == reminder_id).first()
     if rem:
         db.delete(rem)
         db.commit()
+        _emit("reminder_deleted", reminder_id)
         return True
     return False
+
+def delete_reminders(db: Session, reminder_ids: List[int]) -> int:
+    """Delete a batch of reminders with a single DELETE ... WHERE id IN (...) and one commit."""
+    if not reminder_ids:
+        return 0
+    deleted = (
+        db.query(models.Reminder)
+        .filter(models.Reminder.id.in_(reminder_ids))
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    for rid in reminder_ids:
+        _emit("reminder_deleted", rid)
+    return deleted
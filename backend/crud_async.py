@@ -0,0 +1,196 @@
+# backend/crud_async.py
+"""
+AsyncSession versions of the crud functions the request handlers use.
+
+Same queries, ordering, cursors and write hooks as backend/crud.py (the pure
+helpers are shared from there); only the I/O is awaited. Sessions come from
+database.AsyncSessionLocal (expire_on_commit=False), and anything a response
+serializes is loaded up front: relationships can't lazy-load under asyncio.
+"""
+from typing import List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+import backend.models as models
+import backend.schemas as schemas
+from backend.crud import IST, NOTE_ORDER, TASK_ORDER, _emit, _task_filters, cancel_pending_reminders
+from backend.pagination import decode_cursor, encode_cursor, keyset_after, nulls_sort_low
+
+# TASKS
+async def create_task(db: AsyncSession, task: schemas.TaskCreate) -> models.Task:
+    db_task = models.Task(
+        title=task.title,
+        description=task.description,
+        due_datetime=task.due_datetime,
+        priority=task.priority or 2,
+        tags=task.tags or ""
+    )
+    db.add(db_task)
+    await db.commit()
+    await db.refresh(db_task)
+    _emit("task_created", db_task.id, db_task)
+    return db_task
+
+async def get_task(db: AsyncSession, task_id: int) -> Optional[models.Task]:
+    result = await db.execute(
+        select(models.Task)
+        .options(selectinload(models.Task.reminders))
+        .filter(models.Task.id == task_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
+async def list_tasks_page(db: AsyncSession, filter_by: Optional[str] = None, limit: int = 50, cursor: Optional[str] = None):
+    """Same contract as crud.list_tasks_page: (tasks, next_cursor), ValueError for a bad cursor."""
+    q = select(models.Task).options(selectinload(models.Task.reminders)).filter(*_task_filters(filter_by))
+    if cursor:
+        values = decode_cursor(cursor, len(TASK_ORDER))
+        q = q.filter(keyset_after(TASK_ORDER, values, nulls_sort_low(db.bind.dialect.name)))
+    q = q.order_by(models.Task.priority.asc(), models.Task.due_datetime.asc(), models.Task.id.asc()).limit(limit + 1)
+    rows = (await db.execute(q)).scalars().all()
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor([last.priority, last.due_datetime, last.id])
+
+async def update_task(db: AsyncSession, task_id: int, changes: schemas.TaskUpdate) -> Optional[models.Task]:
+    db_task = await get_task(db, task_id)
+    if not db_task:
+        return None
+    for field, value in changes.dict(exclude_unset=True).items():
+        setattr(db_task, field, value)
+    await db.commit()
+    # updated_at is set by the database; reload it (and reminders) in one query
+    db_task = await get_task(db, task_id)
+    _emit("task_updated", db_task.id, db_task)
+    return db_task
+
+async def patch_task(db: AsyncSession, task_id: int, changes: schemas.TaskUpdate) -> Optional[models.Task]:
+    """
+    Partial update without loading the task first: one UPDATE ... WHERE id = :id
+    for the fields present in `changes`. Setting status "done" also cancels the
+    task's pending reminders in the same transaction.
+    """
+    values = changes.dict(exclude_unset=True)
+    cancelled = []
+    if values:
+        result = await db.execute(
+            update(models.Task.__table__).where(models.Task.id == task_id).values(**values).returning(models.Task.id)
+        )
+        if result.first() is None:
+            await db.rollback()
+            return None
+        if values.get("status") == "done":
+            cancelled = list((await db.execute(cancel_pending_reminders([task_id]))).scalars())
+        await db.commit()
+    db_task = await get_task(db, task_id)
+    if db_task and values:
+        _emit("task_updated", db_task.id, db_task)
+        for rid in cancelled:
+            _emit("reminder_deleted", rid)
+    return db_task
+
+async def delete_task(db: AsyncSession, task_id: int) -> bool:
+    db_task = await get_task(db, task_id)
+    if not db_task:
+        return False
+    await db.delete(db_task)
+    await db.commit()
+    _emit("task_deleted", task_id)
+    return True
+
+# NOTES
+async def create_note(db: AsyncSession, note: schemas.NoteCreate) -> models.Note:
+    db_note = models.Note(title=note.title, content=note.content, tags="", tagging_status="pending")
+    db.add(db_note)
+    await db.commit()
+    await db.refresh(db_note)
+    _emit("note_created", db_note.id, db_note)
+    return db_note
+
+async def list_notes_page(db: AsyncSession, limit: int = 50, cursor: Optional[str] = None):
+    q = select(models.Note)
+    if cursor:
+        values = decode_cursor(cursor, len(NOTE_ORDER))
+        q = q.filter(keyset_after(NOTE_ORDER, values, nulls_sort_low(db.bind.dialect.name)))
+    q = q.order_by(models.Note.id.desc()).limit(limit + 1)
+    rows = (await db.execute(q)).scalars().all()
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor([last.id])
+
+async def count_notes(db: AsyncSession) -> dict:
+    """Note totals by tagging status, in one GROUP BY."""
+    result = await db.execute(
+        select(models.Note.tagging_status, func.count()).group_by(models.Note.tagging_status)
+    )
+    by_status = dict(result.all())
+    return {
+        "total": sum(by_status.values()),
+        "tagging_pending": by_status.get("pending", 0),
+        "tagging_failed": by_status.get("failed", 0),
+    }
+
+async def delete_note(db: AsyncSession, note_id: int) -> bool:
+    note = await db.get(models.Note, note_id)
+    if not note:
+        return False
+    await db.delete(note)
+    await db.commit()
+    _emit("note_deleted", note_id)
+    return True
+
+# REMINDERS
+async def create_reminder(db: AsyncSession, rem: schemas.ReminderCreate) -> models.Reminder:
+    remind_at = rem.remind_at
+    # naive means IST, like crud.create_reminder
+    remind_at = IST.localize(remind_at) if remind_at.tzinfo is None else remind_at.astimezone(IST)
+    db_rem = models.Reminder(task_id=rem.task_id, remind_at=remind_at)
+    db.add(db_rem)
+    await db.commit()
+    await db.refresh(db_rem)
+    _emit("reminder_created", db_rem.id, db_rem)
+    return db_rem
+
+async def list_pending_reminders(db: AsyncSession) -> List[models.Reminder]:
+    result = await db.execute(
+        select(models.Reminder).filter(models.Reminder.notified == False).order_by(models.Reminder.remind_at.asc())
+    )
+    return result.scalars().all()
+
+async def list_pending_reminders_with_titles(db: AsyncSession) -> List[dict]:
+    """list_pending_reminders joined with each reminder's task title, in one query."""
+    result = await db.execute(
+        select(models.Reminder, models.Task.title)
+        .outerjoin(models.Task, models.Task.id == models.Reminder.task_id)
+        .filter(models.Reminder.notified == False)
+        .order_by(models.Reminder.remind_at.asc())
+    )
+    return [
+        {
+            "id": r.id,
+            "task_id": r.task_id,
+            "remind_at": r.remind_at,
+            "notified": r.notified,
+            "created_at": r.created_at,
+            "task_title": title,
+        }
+        for r, title in result.all()
+    ]
+
+# DASHBOARD
+async def get_dashboard(db: AsyncSession, filter_by: Optional[str] = None, limit: int = 50, cursor: Optional[str] = None) -> dict:
+    """
+    Everything the Tasks tab shows, in four queries whatever the data: the task
+    page (plus one selectin for its reminders), pending reminders with their
+    task titles, and note counts. ValueError for a bad cursor.
+    """
+    items, next_cursor = await list_tasks_page(db, filter_by=filter_by, limit=limit, cursor=cursor)
+    return {
+        "tasks": {"items": items, "limit": limit, "next_cursor": next_cursor},
+        "reminders": await list_pending_reminders_with_titles(db),
+        "notes": await count_notes(db),
+    }
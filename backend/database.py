@@ -15,17 +15,144 @@
 
 
 import os
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
 
 # Use DATABASE_URL from env, fallback to SQLite file
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./taskai.db")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
-)
+# ENGINE PROFILES
+# DB_PROFILE=tuned (default) applies the settings below; DB_PROFILE=default
+# leaves everything at the driver/SQLAlchemy defaults (for comparison, see
+# benchmarks/bench_db_profiles.py).
+#
+# SQLite, on every new connection:
+#   journal_mode=WAL       readers don't block the writer (scheduler, tagging) and vice versa
+#   synchronous=NORMAL     fsync at checkpoints, not every commit; safe with WAL
+#   mmap_size, cache_size  read pages through the OS page cache / keep more pages per connection
+#   busy_timeout           wait for the write lock instead of failing with "database is locked"
+# Server databases (Postgres, MySQL): connection pool sizing and health checks.
+DB_PROFILE = os.getenv("DB_PROFILE", "tuned")
+
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negative = KiB, i.e. 64 MiB
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+}
+
+POOL_OPTIONS = {
+    "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+    "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+    "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),  # under typical server/proxy idle timeouts
+    "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") not in ("0", "false", "no", "off"),
+}
+
+
+def _set_sqlite_pragmas(pragmas: dict):
+    def on_connect(dbapi_conn, _record):
+        cursor = dbapi_conn.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+    return on_connect
+
+
+def _engine_options(url: str, profile: str):
+    """(create_engine kwargs, SQLite pragmas) for `url` under `profile`."""
+    if profile not in ("tuned", "default"):
+        raise ValueError(f"Unknown DB_PROFILE {profile!r}; use 'tuned' or 'default'")
+    is_sqlite = make_url(url).get_backend_name() == "sqlite"
+    options = {"connect_args": {"check_same_thread": False}} if is_sqlite else {}
+    if profile == "tuned" and not is_sqlite:
+        options.update(POOL_OPTIONS)
+    return options, (SQLITE_PRAGMAS if profile == "tuned" and is_sqlite else None)
+
+
+def make_engine(url: str = DATABASE_URL, profile: str = DB_PROFILE, **kwargs):
+    """An engine for `url` configured per `profile` ("tuned" or "default")."""
+    options, pragmas = _engine_options(url, profile)
+    eng = create_engine(url, **{**options, **kwargs})
+    if pragmas:
+        event.listen(eng, "connect", _set_sqlite_pragmas(pragmas))
+    return eng
+
+
+engine = make_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+
+# ASYNC ENGINE
+# Request handlers use an asyncio engine on the same database, so a DB round trip
+# doesn't hold a threadpool thread; the scheduler, tagging workers, migrations and
+# bulk endpoints keep the sync engine above. The async URL is DATABASE_URL with
+# the driver swapped (sqlite -> aiosqlite, postgresql -> asyncpg) unless
+# ASYNC_DATABASE_URL is set. Created on first use, with the same DB_PROFILE; the
+# URL is resolved then too, so a backend without a known async driver only fails
+# when an async session is actually needed, not at import.
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}  # both in requirements.txt
+
+def async_url(url: str) -> str:
+    u = make_url(url)
+    backend = u.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend!r}; set ASYNC_DATABASE_URL")
+    return u.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+def async_database_url() -> str:
+    return os.getenv("ASYNC_DATABASE_URL") or async_url(DATABASE_URL)
+
+_async_engine = None
+_async_sessions = None
+
+def make_async_engine(url: Optional[str] = None, profile: str = DB_PROFILE, **kwargs):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = url or async_database_url()
+    options, pragmas = _engine_options(url, profile)
+    eng = create_async_engine(url, **{**options, **kwargs})
+    if pragmas:
+        event.listen(eng.sync_engine, "connect", _set_sqlite_pragmas(pragmas))
+    return eng
+
+def get_async_engine():
+    global _async_engine, _async_sessions
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        _async_engine = make_async_engine()
+        # no expiry on commit: attributes can't lazy-load under asyncio, so
+        # returned objects must stay readable after the transaction ends
+        _async_sessions = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+def AsyncSessionLocal():
+    get_async_engine()
+    return _async_sessions()
+
+async def dispose_async_engine():
+    global _async_engine, _async_sessions
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = _async_sessions = None
+
+
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+def init_db(revision: str = "head"):
+    """Bring the schema up to date (same as `alembic upgrade head`)."""
+    from alembic import command
+    from alembic.config import Config
+
+    cfg = Config()
+    cfg.set_main_option("script_location", MIGRATIONS_DIR)
+    with engine.begin() as conn:
+        cfg.attributes["connection"] = conn
+        command.upgrade(cfg, revision)
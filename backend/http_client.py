@@ -0,0 +1,140 @@
+# backend/http_client.py
+"""
+Shared HTTP plumbing for outbound API calls (Gemini, Telegram): keep-alive
+sessions with a sized connection pool, jittered exponential backoff, and a
+circuit breaker that fails fast while an upstream is unhealthy.
+"""
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def make_session(pool_size: int = 10) -> requests.Session:
+    """A requests.Session that keeps up to `pool_size` connections per host alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Exponential backoff with jitter: a random delay in [d/2, d], d = min(cap, base * 2**attempt)."""
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def retry_after_seconds(resp: requests.Response):
+    """The Retry-After header as seconds, if the server sent a numeric one."""
+    value = resp.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is unavailable, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    closed:    calls go through; `failure_threshold` consecutive failures open the circuit
+    open:      calls fail immediately with CircuitOpenError for `reset_timeout` seconds
+    half-open: one trial call is let through; success closes, failure re-opens
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpenError unless a call may go through now. True if this call is the half-open trial."""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return False
+            if state == "half-open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+            raise CircuitOpenError(self.name, max(remaining, 1.0))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_running:
+                    print(f"[http] circuit '{self.name}' opened after {self._failures} failures")
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def release(self, trial: bool):
+        """A call ended without a verdict (cancelled, rejected locally, our own bug): free the trial slot."""
+        if trial:
+            with self._lock:
+                self._trial_running = False
+
+    def call(self) -> "BreakerCall":
+        """
+        Guard one call: `with breaker.call() as call:` then call.success() or
+        call.failure(). Leaving the block without either releases the half-open
+        trial, so an abandoned trial can't keep the circuit from ever closing.
+        """
+        return BreakerCall(self, self.before_call())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"state": self._state(), "consecutive_failures": self._failures}
+
+
+class BreakerCall:
+    def __init__(self, breaker: CircuitBreaker, trial: bool):
+        self.breaker = breaker
+        self.trial = trial
+        self.done = False
+
+    def success(self):
+        self.breaker.record_success()
+        self.done = True
+
+    def failure(self):
+        self.breaker.record_failure()
+        self.done = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not self.done:
+            self.breaker.release(self.trial)
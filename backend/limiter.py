@@ -0,0 +1,76 @@
+# backend/limiter.py
+"""
+Async concurrency limiter with a bounded wait queue.
+
+At most `max_inflight` holders run at once and at most `max_waiting` callers
+wait for a slot; beyond that, entering raises LimiterFull right away so the
+API can answer 503 instead of letting requests pile up behind a slow upstream.
+
+Limiters are built at import, before any event loop runs, so the semaphore is
+created on first use and re-created when a different loop shows up (a fresh
+TestClient, a uvicorn reload); slots held on the old loop died with it.
+"""
+import asyncio
+from typing import Optional
+
+
+class LimiterFull(RuntimeError):
+    def __init__(self, name: str):
+        super().__init__(f"too many concurrent {name} requests, try again shortly")
+        self.name = name
+
+
+class ConcurrencyLimiter:
+    def __init__(self, name: str, max_inflight: int = 16, max_waiting: int = 64):
+        self.name = name
+        self.max_inflight = max_inflight
+        self.max_waiting = max_waiting
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight = 0
+        self._waiting = 0
+        self.rejected = 0
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    async def acquire(self):
+        """Take a slot (waiting if allowed); pair with release() when the slot outlives a `with` block."""
+        sem = self._semaphore()
+        if sem.locked():
+            if self._waiting >= self.max_waiting:
+                self.rejected += 1
+                raise LimiterFull(self.name)
+            self._waiting += 1
+            try:
+                await sem.acquire()
+            finally:
+                self._waiting -= 1
+        else:
+            await sem.acquire()
+        self._inflight += 1
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_inflight)
+            self._loop = loop
+            self._inflight = self._waiting = 0
+        return self._sem
+
+    def release(self):
+        self._inflight -= 1
+        self._sem.release()
+
+    def stats(self) -> dict:
+        return {
+            "inflight": self._inflight,
+            "waiting": self._waiting,
+            "max_inflight": self.max_inflight,
+            "max_waiting": self.max_waiting,
+            "rejected": self.rejected,
+        }
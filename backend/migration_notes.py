@@ -1,6 +1,8 @@
 # backend/migrate_notes.py
-from backend.database import engine
+# The notes.tags column is now part of the Alembic baseline (backend/migrations,
+# revision 0001). Running this script just upgrades the schema to head.
+from backend.database import init_db
 
-with engine.connect() as conn:
-    conn.execute("ALTER TABLE notes ADD COLUMN tags VARCHAR DEFAULT ''")
-    print("✅ 'tags' column added to notes table")
+if __name__ == "__main__":
+    init_db()
+    print("✅ database schema is up to date")
@@ -0,0 +1,48 @@
+# backend/migrations/env.py
+from logging.config import fileConfig
+
+from alembic import context
+
+from backend.database import Base, engine
+import backend.models  # noqa: F401  (registers tables on Base.metadata)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def _configure(**kwargs):
+    # SQLite can't ALTER most things in place; batch mode recreates the table instead
+    context.configure(
+        target_metadata=target_metadata,
+        render_as_batch=engine.dialect.name == "sqlite",
+        **kwargs,
+    )
+
+
+def run_migrations_offline():
+    _configure(url=engine.url.render_as_string(hide_password=False), literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    # backend.database.init_db() hands us an open connection; the alembic CLI does not
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+    with engine.begin() as connection:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,76 @@
+"""initial schema
+
+Baseline for databases created by Base.metadata.create_all and
+migration_notes.py: only creates what is missing, so it can be applied on
+top of an existing taskai.db.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+
+    if "tasks" not in existing:
+        op.create_table(
+            "tasks",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(256), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("due_datetime", sa.DateTime(), nullable=True),
+            sa.Column("status", sa.String(32), nullable=False),
+            sa.Column("priority", sa.Integer(), nullable=True),
+            sa.Column("tags", sa.String(256), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_tasks_id", "tasks", ["id"])
+
+    if "notes" not in existing:
+        op.create_table(
+            "notes",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("title", sa.String(256), nullable=True),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("tags", sa.String(), nullable=True),
+        )
+        op.create_index("ix_notes_id", "notes", ["id"])
+    elif "tags" not in {c["name"] for c in inspector.get_columns("notes")}:
+        # what migration_notes.py used to do by hand
+        op.add_column("notes", sa.Column("tags", sa.String(), server_default="", nullable=True))
+
+    if "reminders" not in existing:
+        op.create_table(
+            "reminders",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("task_id", sa.Integer(), sa.ForeignKey("tasks.id", ondelete="CASCADE"), nullable=True),
+            sa.Column("remind_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("notified", sa.Boolean(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        )
+        op.create_index("ix_reminders_id", "reminders", ["id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("reminders")
+    op.drop_table("notes")
+    op.drop_table("tasks")
@@ -0,0 +1,49 @@
+"""hot path indexes
+
+- reminders (notified, remind_at): crud.get_due_reminders / the scheduler drain
+- reminders (task_id): loading a task's reminders
+- tasks (priority, due_datetime, id): list_tasks ordering
+- tasks (due_datetime): the "today" filter
+- tasks (due_datetime) WHERE status != 'done': the "overdue" filter. A partial
+  index, because due_datetime < now alone matches nearly all of history.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_reminders_notified_remind_at", "reminders", ["notified", "remind_at"])
+    op.create_index("ix_reminders_task_id", "reminders", ["task_id"])
+    op.create_index("ix_tasks_priority_due_datetime_id", "tasks", ["priority", "due_datetime", "id"])
+    op.create_index("ix_tasks_due_datetime", "tasks", ["due_datetime"])
+    op.create_index(
+        "ix_tasks_open_due_datetime",
+        "tasks",
+        ["due_datetime"],
+        sqlite_where=sa.text("status != 'done'"),
+        postgresql_where=sa.text("status != 'done'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_tasks_open_due_datetime", table_name="tasks")
+    op.drop_index("ix_tasks_due_datetime", table_name="tasks")
+    op.drop_index("ix_tasks_priority_due_datetime_id", table_name="tasks")
+    op.drop_index("ix_reminders_task_id", table_name="reminders")
+    op.drop_index("ix_reminders_notified_remind_at", table_name="reminders")
@@ -0,0 +1,34 @@
+"""note tagging status
+
+notes.tagging_status for the background tagging queue (backend/tagging.py).
+Existing notes were tagged synchronously on insert, so they start as "done".
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("notes", sa.Column("tagging_status", sa.String(length=16), nullable=False, server_default="done"))
+    op.create_index("ix_notes_tagging_status", "notes", ["tagging_status"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_notes_tagging_status", table_name="notes")
+    with op.batch_alter_table("notes") as batch_op:
+        batch_op.drop_column("tagging_status")
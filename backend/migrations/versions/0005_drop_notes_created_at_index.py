@@ -0,0 +1,33 @@
+"""drop notes listing index
+
+Notes are now paged by id alone (crud.NOTE_ORDER): created_at is stored with
+second precision on SQLite and didn't survive the round trip through a cursor.
+The primary key serves the newest-first listing, so the (created_at, id)
+index from 0003 only costs writes.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_index("ix_notes_created_at_id", table_name="notes")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_notes_created_at_id", "notes", ["created_at", "id"])
@@ -0,0 +1,41 @@
+"""note tagging status server default
+
+0004 gave notes.tagging_status a server default of "done" so the notes that
+existed then (tagged synchronously on insert) were backfilled as done. Kept as
+the default, it also marked any row inserted outside the ORM (bulk loads, SQL
+consoles) as done, and the tagging sweeper never picked those up. New rows now
+default to "pending" at the database too, matching models.Note; existing rows
+keep their status.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 18:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("notes") as batch_op:
+        batch_op.alter_column(
+            "tagging_status", existing_type=sa.String(length=16), existing_nullable=False, server_default="pending"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("notes") as batch_op:
+        batch_op.alter_column(
+            "tagging_status", existing_type=sa.String(length=16), existing_nullable=False, server_default="done"
+        )
@@ -1,5 +1,5 @@
 # backend/models.py
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.database import Base
@@ -19,6 +19,18 @@ class Task(Base):
     # relationship to reminders
     reminders = relationship("Reminder", back_populates="task", cascade="all, delete-orphan")
 
+    # keep in sync with backend/migrations (revision 0002)
+    __table_args__ = (
+        Index("ix_tasks_priority_due_datetime_id", "priority", "due_datetime", "id"),  # list ordering
+        Index("ix_tasks_due_datetime", "due_datetime"),  # today filter
+        Index(  # overdue filter: only open tasks, history is mostly done
+            "ix_tasks_open_due_datetime",
+            "due_datetime",
+            sqlite_where=text("status != 'done'"),
+            postgresql_where=text("status != 'done'"),
+        ),
+    )
+
     class Config:
         from_attributes = True  # instead of orm_mode = True
 
@@ -30,6 +42,12 @@ class Note(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     tags = Column(String, default="")  # store comma-separated tags
+    # pending -> done | failed, set by the background tagging queue
+    tagging_status = Column(String(16), nullable=False, default="pending", server_default="pending")
+
+    __table_args__ = (
+        Index("ix_notes_tagging_status", "tagging_status"),  # tagging sweeper / pending-jobs endpoint
+    )
 
 class Reminder(Base):
     __tablename__ = "reminders"
@@ -40,3 +58,8 @@ class Reminder(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     task = relationship("Task", back_populates="reminders")
+
+    __table_args__ = (
+        Index("ix_reminders_notified_remind_at", "notified", "remind_at"),  # due reminder scan
+        Index("ix_reminders_task_id", "task_id"),
+    )
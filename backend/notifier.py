@@ -0,0 +1,213 @@
+# backend/notifier.py
+"""
+Background delivery of Telegram notifications.
+
+Callers (the reminder scheduler) only enqueue messages. A small pool of worker
+threads drains the queue over one keep-alive requests.Session, with timeouts,
+retry with exponential backoff, and a client-side rate limiter sized to
+Telegram's limits (about 1 message/s per chat and 30 messages/s per bot).
+"""
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+import requests
+
+import backend.utils as utils
+from backend.http_client import backoff_delay, make_session
+
+TELEGRAM_WORKERS = int(os.getenv("TELEGRAM_WORKERS", "4"))
+TELEGRAM_QUEUE_SIZE = int(os.getenv("TELEGRAM_QUEUE_SIZE", "10000"))
+TELEGRAM_TIMEOUT = float(os.getenv("TELEGRAM_TIMEOUT", "10"))  # seconds per HTTP call
+TELEGRAM_MAX_RETRIES = int(os.getenv("TELEGRAM_MAX_RETRIES", "5"))
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))  # messages/s across all chats
+TELEGRAM_CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))  # messages/s per chat
+
+
+class TokenBucket:
+    """Blocking token bucket; acquire() reserves a token and sleeps until it is available."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+
+
+class RateLimiter:
+    """Per-chat buckets in front of one global bucket."""
+
+    def __init__(self, global_rate: float = TELEGRAM_GLOBAL_RATE, chat_rate: float = TELEGRAM_CHAT_RATE):
+        self.chat_rate = chat_rate
+        self._global = TokenBucket(global_rate)
+        self._chats = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, chat_id: str):
+        with self._lock:
+            bucket = self._chats.get(chat_id)
+            if bucket is None:
+                bucket = self._chats[chat_id] = TokenBucket(self.chat_rate)
+        bucket.acquire()
+        self._global.acquire()
+
+
+class NotificationDispatcher:
+    def __init__(
+        self,
+        bot_token: Optional[str] = None,
+        chat_id: Optional[str] = None,
+        workers: int = TELEGRAM_WORKERS,
+        queue_size: int = TELEGRAM_QUEUE_SIZE,
+        timeout: float = TELEGRAM_TIMEOUT,
+        max_retries: int = TELEGRAM_MAX_RETRIES,
+        limiter: Optional[RateLimiter] = None,
+    ):
+        self.bot_token = bot_token or utils.TELEGRAM_BOT_TOKEN
+        self.chat_id = chat_id or utils.TELEGRAM_CHAT_ID
+        self.workers = workers
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.limiter = limiter or RateLimiter()
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._session = None
+        self._lock = threading.Lock()  # stats are bumped from every worker thread
+        self._stop = threading.Event()
+        self.stats = {"enqueued": 0, "sent": 0, "failed": 0, "dropped": 0, "retried": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.bot_token and self.chat_id)
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        self._session = make_session(self.workers)
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"telegram-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        print(f"[notifier] started {self.workers} telegram workers")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        # sentinels only wake idle workers; with a full queue none is idle, and
+        # busy ones see _stop on their next get. Messages still queued are dropped.
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+        if self._session is not None:
+            self._session.close()
+
+    def enqueue(self, title: str, body: str, chat_id: Optional[str] = None) -> bool:
+        """Queue a message for delivery. Returns False if it was dropped."""
+        if not self.enabled:
+            return False
+        try:
+            self._queue.put_nowait((chat_id or self.chat_id, title, body))
+        except queue.Full:
+            self._count("dropped")
+            print(f"[notifier] queue full, dropped telegram message: {title}")
+            return False
+        self._count("enqueued")
+        return True
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None or self._stop.is_set():
+                    return
+                self._deliver(*item)
+            except Exception as e:
+                print(f"[notifier] unexpected error: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _deliver(self, chat_id: str, title: str, body: str):
+        url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        payload = utils.telegram_payload(title, body, chat_id)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(chat_id)
+            delay = None
+            try:
+                resp = self._session.post(url, json=payload, timeout=self.timeout)
+                if resp.ok:
+                    self._count("sent")
+                    return
+                if resp.status_code == 429:
+                    # Telegram tells us how long to back off
+                    try:
+                        delay = float(resp.json().get("parameters", {}).get("retry_after", 0)) or None
+                    except ValueError:
+                        delay = None
+                elif resp.status_code < 500:
+                    print(f"[notifier] telegram rejected message ({resp.status_code}): {resp.text[:200]}")
+                    break
+                error = f"HTTP {resp.status_code}"
+            except requests.RequestException as e:
+                error = str(e)
+            if attempt < self.max_retries:
+                self._count("retried")
+                if self._stop.wait(delay if delay is not None else backoff_delay(attempt)):
+                    break  # shutting down
+        else:
+            print(f"[notifier] giving up after {self.max_retries + 1} attempts: {error}")
+        self._count("failed")
+
+
+_dispatcher: Optional[NotificationDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+def get_dispatcher() -> NotificationDispatcher:
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = NotificationDispatcher()
+            if _dispatcher.enabled:
+                _dispatcher.start()
+            else:
+                print("[notifier] TELEGRAM_BOT_TOKEN/TELEGRAM_CHAT_ID not set, telegram disabled")
+    return _dispatcher
+
+def stop_dispatcher():
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is not None:
+            _dispatcher.stop()
+            _dispatcher = None
+
+def send_telegram(title: str, body: str) -> bool:
+    """Non-blocking: hand the message to the dispatcher."""
+    return get_dispatcher().enqueue(title, body)
@@ -0,0 +1,72 @@
+# backend/pagination.py
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is the sort key of the last row of a page, JSON-encoded and
+urlsafe-base64'd. The next page is "rows strictly after that key" in the
+query's ORDER BY, which an index on the same columns can answer with a seek
+instead of an OFFSET scan.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import and_, false, or_
+
+
+def encode_cursor(values: Sequence) -> str:
+    payload = [{"$dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """Inverse of encode_cursor. Raises ValueError on anything malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [
+            datetime.fromisoformat(v["$dt"]) if isinstance(v, dict) else v
+            for v in payload
+        ]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"invalid cursor: {e}") from None
+    if len(values) != size:
+        raise ValueError("invalid cursor: wrong number of keys")
+    return values
+
+
+def nulls_sort_low(dialect_name: str) -> bool:
+    """SQLite/MySQL treat NULL as the smallest value when sorting; PostgreSQL/Oracle as the largest."""
+    return dialect_name not in ("postgresql", "oracle")
+
+
+def keyset_after(keys: List[Tuple], values: Sequence, nulls_low: bool = True):
+    """
+    Filter for rows strictly after `values` in ORDER BY `keys`.
+
+    keys:   [(column, descending), ...] matching the query's ORDER BY
+    values: the cursor, one value per key (None for NULL)
+    """
+    clauses = []
+    equal_so_far = []
+    for (col, desc), value in zip(keys, values):
+        nulls_first = nulls_low != desc
+        if value is None:
+            after = col.isnot(None) if nulls_first else false()
+            equal = col.is_(None)
+        else:
+            after = col < value if desc else col > value
+            if not nulls_first:
+                after = or_(after, col.is_(None))
+            equal = col == value
+        clauses.append(and_(*equal_so_far, after))
+        equal_so_far.append(equal)
+    condition = or_(*clauses)
+
+    # redundant range on the leading key so the planner can seek on the index
+    col, desc = keys[0]
+    if values[0] is not None and nulls_low != desc:
+        condition = and_(col <= values[0] if desc else col >= values[0], condition)
+    return condition
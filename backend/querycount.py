@@ -0,0 +1,47 @@
+# backend/querycount.py
+"""
+Count the SQL statements a block of code sends to the database, to catch N+1
+regressions (e.g. lazy-loading Task.reminders once per task).
+
+    with assert_max_queries(2):
+        tasks, _ = crud.list_tasks_page(db, limit=50)
+        [schemas.TaskOut.model_validate(t, from_attributes=True) for t in tasks]
+"""
+from contextlib import contextmanager
+from typing import List
+
+from sqlalchemy import event
+
+from backend.database import engine
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(bind=engine):
+    counter = QueryCounter()
+    event.listen(bind, "before_cursor_execute", counter._on_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", counter._on_execute)
+
+
+@contextmanager
+def assert_max_queries(limit: int, bind=engine):
+    """Raise AssertionError if the block runs more than `limit` statements."""
+    with count_queries(bind) as counter:
+        yield counter
+    if counter.count > limit:
+        listing = "\n".join(f"  {i + 1}. {s.splitlines()[0]}" for i, s in enumerate(counter.statements))
+        raise AssertionError(f"expected at most {limit} queries, got {counter.count}:\n{listing}")
@@ -0,0 +1,279 @@
+# backend/retrieval.py
+"""
+Local retrieval for /ai/query context.
+
+Instead of pasting every task and note into the Gemini prompt, keep a BM25
+index over task titles/descriptions/tags and note titles/contents/tags and
+send only the top-k items relevant to the question, cut to a character
+budget. The index is a sparse term -> (doc slots, term frequencies) matrix
+held in NumPy arrays; scoring a query is a handful of vectorized operations.
+
+It is built from the DB on first use and kept current through the crud write
+hooks. Done tasks are indexed too ("what did I finish last week?"). A periodic
+rebuild, on a background thread while the current index keeps serving, picks
+up writes made by other processes.
+"""
+import math
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+import backend.crud as crud
+import backend.models as models
+from backend.database import SessionLocal
+
+TOP_K = int(os.getenv("AI_CONTEXT_TOP_K", "20"))
+# prompt context budget; AI_CONTEXT_TOKEN_BUDGET (≈4 chars/token) wins if set
+CHARS_PER_TOKEN = 4
+_token_budget = os.getenv("AI_CONTEXT_TOKEN_BUDGET")
+CHAR_BUDGET = int(_token_budget) * CHARS_PER_TOKEN if _token_budget else int(os.getenv("AI_CONTEXT_CHAR_BUDGET", "6000"))
+REBUILD_SECONDS = int(os.getenv("AI_INDEX_REBUILD_SECONDS", "600"))
+NOTE_SNIPPET_CHARS = 300
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by do for from has have i in is it me my of on or so that the this to "
+    "was what when where which who will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+class BM25Index:
+    """Incrementally updatable BM25 index. Documents are keyed by ("task"|"note", id)."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._vocab: Dict[str, int] = {}
+        self._postings: List[Dict[int, int]] = []  # term id -> {slot: tf}
+        self._arrays: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}  # term id -> (slots, tfs), cached
+        self._doc_len = np.zeros(64, dtype=np.float32)
+        self._doc_terms: List[Optional[Dict[int, int]]] = []  # slot -> {term id: tf}
+        self._keys: List[Optional[tuple]] = []
+        self._lines: List[Optional[str]] = []  # slot -> rendered context line
+        self._slots: Dict[tuple, int] = {}
+        self._free: List[int] = []
+        self._total_len = 0.0
+
+    def __len__(self):
+        return len(self._slots)
+
+    def upsert(self, key: tuple, text: str, line: str):
+        tokens = tokenize(text)
+        with self._lock:
+            terms: Dict[int, int] = {}
+            for tok in tokens:
+                tid = self._vocab.get(tok)
+                if tid is None:
+                    tid = self._vocab[tok] = len(self._postings)
+                    self._postings.append({})
+                terms[tid] = terms.get(tid, 0) + 1
+            self._remove(key)
+            slot = self._free.pop() if self._free else self._new_slot()
+            for tid, tf in terms.items():
+                self._postings[tid][slot] = tf
+                self._arrays.pop(tid, None)
+            length = float(sum(terms.values()))
+            self._doc_len[slot] = length
+            self._total_len += length
+            self._doc_terms[slot] = terms
+            self._keys[slot] = key
+            self._lines[slot] = line
+            self._slots[key] = slot
+
+    def remove(self, key: tuple):
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: tuple):
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+        for tid in self._doc_terms[slot]:
+            self._postings[tid].pop(slot, None)
+            self._arrays.pop(tid, None)
+        self._total_len -= float(self._doc_len[slot])
+        self._doc_len[slot] = 0.0
+        self._doc_terms[slot] = None
+        self._keys[slot] = None
+        self._lines[slot] = None
+        self._free.append(slot)
+
+    def _new_slot(self) -> int:
+        slot = len(self._keys)
+        if slot >= len(self._doc_len):
+            grown = np.zeros(len(self._doc_len) * 2, dtype=np.float32)
+            grown[: len(self._doc_len)] = self._doc_len
+            self._doc_len = grown
+        self._doc_terms.append(None)
+        self._keys.append(None)
+        self._lines.append(None)
+        return slot
+
+    def _posting_arrays(self, tid: int) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(tid)
+        if arrays is None:
+            posting = self._postings[tid]
+            arrays = (
+                np.fromiter(posting.keys(), dtype=np.int64, count=len(posting)),
+                np.fromiter(posting.values(), dtype=np.float32, count=len(posting)),
+            )
+            self._arrays[tid] = arrays
+        return arrays
+
+    def search(self, query: str, k: int = TOP_K) -> List[Tuple[tuple, float, str]]:
+        """Top-k (key, score, context line) for `query`, best first."""
+        with self._lock:
+            n_docs = len(self._slots)
+            tids = {self._vocab[t] for t in tokenize(query) if t in self._vocab}
+            if not n_docs or not tids:
+                return []
+            avgdl = max(self._total_len / n_docs, 1.0)
+            scores = np.zeros(len(self._keys), dtype=np.float32)
+            for tid in tids:
+                slots, tfs = self._posting_arrays(tid)
+                if not len(slots):
+                    continue
+                idf = math.log(1.0 + (n_docs - len(slots) + 0.5) / (len(slots) + 0.5))
+                norm = self.k1 * (1.0 - self.b + self.b * self._doc_len[slots] / avgdl)
+                scores[slots] += idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+            hits = np.flatnonzero(scores > 0)
+            if len(hits) > k:
+                hits = hits[np.argpartition(scores[hits], -k)[-k:]]
+            hits = hits[np.argsort(-scores[hits], kind="stable")]
+            return [(self._keys[s], float(scores[s]), self._lines[s]) for s in hits]
+
+
+def _task_doc(t: models.Task) -> Tuple[str, str]:
+    text = " ".join(filter(None, [t.title, t.description, t.tags]))
+    line = f"- Task: {t.title} | Status: {t.status} | Priority: {t.priority} | Due: {t.due_datetime}"
+    return text, line
+
+
+def _note_doc(n: models.Note) -> Tuple[str, str]:
+    text = " ".join(filter(None, [n.title, n.content, n.tags]))
+    content = n.content or ""
+    snippet = content[:NOTE_SNIPPET_CHARS] + ("..." if len(content) > NOTE_SNIPPET_CHARS else "")
+    return text, f"- Note: {n.title} | {snippet}"
+
+
+_index: Optional[BM25Index] = None
+_built_at = 0.0
+_build_lock = threading.Lock()
+_rebuilding = False
+_missed: List[tuple] = []  # index ops from writes made while a background rebuild reads the DB
+
+
+def _apply(index: BM25Index, op: tuple):
+    if op[0] == "upsert":
+        index.upsert(*op[1:])
+    else:
+        index.remove(op[1])
+
+
+def _on_write(event: str, obj_id: int, obj=None):
+    # render the document now: obj may be expired or detached by the time a rebuild replays it
+    if event in ("task_created", "task_updated") and obj is not None:
+        op = ("upsert", ("task", obj_id), *_task_doc(obj))
+    elif event in ("note_created", "note_updated") and obj is not None:
+        op = ("upsert", ("note", obj_id), *_note_doc(obj))
+    elif event == "task_deleted":
+        op = ("remove", ("task", obj_id))
+    elif event == "note_deleted":
+        op = ("remove", ("note", obj_id))
+    else:
+        return
+    with _build_lock:
+        index = _index
+        if _rebuilding:
+            _missed.append(op)
+    if index is not None:
+        _apply(index, op)
+
+
+def _build(db: Session) -> BM25Index:
+    index = BM25Index()
+    for t in db.query(models.Task).all():
+        index.upsert(("task", t.id), *_task_doc(t))
+    for n in db.query(models.Note).all():
+        index.upsert(("note", n.id), *_note_doc(n))
+    return index
+
+
+def _rebuild_in_background():
+    global _index, _built_at, _rebuilding
+    db = SessionLocal()
+    try:
+        index = _build(db)
+    except Exception as e:
+        print(f"[retrieval] index rebuild failed, keeping the current one: {e}")
+        index = None
+    finally:
+        db.close()
+    with _build_lock:
+        if index is not None:
+            # writes that landed while we were reading; replaying one the snapshot already saw is harmless
+            for op in _missed:
+                _apply(index, op)
+            _index = index
+        _built_at = time.monotonic()  # after a failure, try again in another period
+        _missed.clear()
+        _rebuilding = False
+
+
+def get_index(db: Session) -> BM25Index:
+    """
+    The process-wide index. Built from the DB on first use (in the calling
+    request); once older than REBUILD_SECONDS it is rebuilt on a background
+    thread and the current one is served until the new one is ready.
+    """
+    global _index, _built_at, _rebuilding
+    with _build_lock:
+        if _index is None:
+            _index, _built_at = _build(db), time.monotonic()
+            crud.add_listener(_on_write)
+        elif not _rebuilding and time.monotonic() - _built_at > REBUILD_SECONDS:
+            _rebuilding = True
+            threading.Thread(target=_rebuild_in_background, name="retrieval-rebuild", daemon=True).start()
+        return _index
+
+
+def build_context(db: Session, prompt: str, top_k: int = TOP_K, char_budget: int = CHAR_BUDGET) -> str:
+    """
+    Context for an /ai/query prompt: the top-k tasks/notes relevant to `prompt`
+    (done tasks included), topped up with the first tasks in list order
+    (priority, due date; any status), within `char_budget`.
+    """
+    lines, used, seen = [], 0, set()
+
+    def add(key, line) -> bool:
+        nonlocal used
+        if key in seen:
+            return True
+        if used + len(line) + 1 > char_budget:
+            return False
+        lines.append(line)
+        seen.add(key)
+        used += len(line) + 1
+        return True
+
+    for key, _, line in get_index(db).search(prompt, top_k):
+        if not add(key, line):
+            break
+    # questions like "what is due today?" rarely share words with task titles,
+    # so fill the rest of the budget with what's next on the list
+    if len(lines) < top_k:
+        tasks, _ = crud.list_tasks_page(db, limit=top_k)
+        for t in tasks:
+            if len(lines) >= top_k or not add(("task", t.id), _task_doc(t)[1]):
+                break
+    return "\n".join(lines) if lines else "No tasks or notes available."
@@ -1,4 +1,5 @@
 # backend/scheduler.py
+import heapq
 import threading
 import time
 from datetime import datetime, timezone
@@ -8,12 +9,60 @@ import os
 from backend.database import SessionLocal
 import backend.crud as crud
 import backend.utils as utils
+import backend.notifier as notifier
 
 import pytz
 
 CHECK_INTERVAL_SECONDS = int(os.getenv("SCHED_CHECK_INTERVAL", "30"))  # frequency to poll reminders
+# "event" keeps upcoming reminders in a heap and sleeps until the next one is due,
+# "poll" scans the reminders table every SCHED_CHECK_INTERVAL seconds.
+SCHED_MODE = os.getenv("SCHED_MODE", "event").lower()
+# how often the event worker re-reads pending reminders from the DB (restarts, other processes)
+RECONCILE_INTERVAL_SECONDS = int(os.getenv("SCHED_RECONCILE_INTERVAL", "300"))
+BATCH_SIZE = int(os.getenv("SCHED_BATCH_SIZE", "500"))  # reminders fetched/deleted per round trip
 IST = pytz.timezone("Asia/Kolkata")
 
+
+def _as_aware(dt: datetime) -> datetime:
+    # reminders are stored as IST wall-clock time; SQLite hands them back naive
+    if dt.tzinfo is None:
+        return IST.localize(dt)
+    return dt
+
+
+def _notify(title: str, body: str):
+    utils.notify_console(body)
+    notifier.send_telegram(title, body)  # queued; delivery happens on the notifier workers
+
+
+def drain_due_reminders(now: datetime, notify=_notify, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Dispatch all reminders due at `now` in batches: one joined query fetches a
+    batch with task titles, then one bulk DELETE clears it. Returns the number sent.
+    """
+    sent = 0
+    db = SessionLocal()
+    try:
+        while True:
+            rows = crud.get_due_reminders_with_titles(db, now, limit=batch_size)
+            if not rows:
+                break
+            for rid, task_id, remind_at, title in rows:
+                title = title or f"Task #{task_id}"
+                body = f"Reminder for task: {title} at {remind_at.strftime('%Y-%m-%d %I:%M %p')}"
+                try:
+                    notify(title, body)
+                except Exception as e:
+                    print(f"[scheduler] notify failed for reminder {rid}: {e}")
+            crud.delete_reminders(db, [row[0] for row in rows])
+            sent += len(rows)
+            if len(rows) < batch_size:
+                break
+    finally:
+        db.close()
+    return sent
+
+
 class ReminderWorker(threading.Thread):
     def __init__(self, interval_seconds: int = CHECK_INTERVAL_SECONDS):
         super().__init__(daemon=True)
@@ -27,51 +76,154 @@ class ReminderWorker(threading.Thread):
             try:
                 now = datetime.now(IST)
                 print("[scheduler] checking at:", now)
-                db = SessionLocal()
-                due = crud.get_due_reminders(db, now)
-                # print("[scheduler] due reminders:", len(due))
-                for r in due:
-                    # fetch task for display
-                    task = crud.get_task(db, r.task_id)
-                    title = task.title if task else f"Task #{r.task_id}"
-
-                    # Calculate actual trigger time
-                    trigger_time = r.remind_at
-                    if trigger_time.tzinfo is None:
-                        trigger_time = IST.localize(trigger_time)  # make aware
-                    if hasattr(r, "advance_minutes") and r.advance_minutes:
-                        from datetime import timedelta
-                        trigger_time = r.remind_at - timedelta(minutes=r.advance_minutes)
-
-
-                    now = datetime.now(IST)
-                    print(f"now : {now}")
-                    print(f"trigger time : {trigger_time}")
-                    if now >= trigger_time:
-                        body = f"Reminder for task: {title} at {r.remind_at.strftime('%Y-%m-%d %I:%M %p')}"
-                        print("console notifier")
-                        utils.notify_console(body)
-                        utils.notify_telegram(title, body) 
-                        crud.mark_reminder_notified(db, r.id)
-                        crud.delete_reminder(db, r.id)
-                    
-                db.close()
+                self.process_due(now)
             except Exception as e:
                 print(f"[scheduler] error: {e}")
             # sleep
             self._stop.wait(self.interval)
 
+    def process_due(self, now: datetime):
+        """Send and clear every reminder that is due at `now`."""
+        sent = drain_due_reminders(now)
+        if sent:
+            print(f"[scheduler] sent {sent} reminders")
+
     def stop(self):
         self._stop.set()
 
+
+class EventReminderWorker(ReminderWorker):
+    """
+    Keeps upcoming reminders in a min-heap ordered by remind_at and sleeps until
+    the earliest one is due. crud write hooks wake it when reminders are created
+    or deleted, and a periodic reconciliation re-reads the table so the heap is
+    correct after restarts or writes from other processes.
+    """
+
+    def __init__(self, reconcile_seconds: int = RECONCILE_INTERVAL_SECONDS):
+        super().__init__(interval_seconds=reconcile_seconds)
+        self.reconcile_interval = reconcile_seconds
+        self._heap = []  # (remind_at timestamp, reminder_id)
+        self._scheduled = {}  # reminder_id -> timestamp; heap entries not matching are stale
+        self._lock = threading.Lock()
+        # while reconcile() reads the table: reminder_id -> timestamp (scheduled) or
+        # None (unscheduled) for changes made meanwhile, which win over the snapshot
+        self._touched: Optional[dict] = None
+        self._wake = threading.Event()
+        self._last_reconcile = float("-inf")  # reconcile on the first loop
+
+    # called from crud on the request thread
+    def on_change(self, event: str, obj_id: int, obj=None):
+        if event == "reminder_created" and obj is not None:
+            self.schedule(obj_id, obj.remind_at)
+        elif event == "reminder_deleted":
+            self.unschedule(obj_id)
+        # task_deleted cascades to its reminders without a reminder_deleted each; their
+        # heap entries stay until they reach the top, and the drain only sends rows
+        # that still exist, so they cost one wake-up at most
+
+    def schedule(self, reminder_id: int, remind_at: datetime):
+        ts = _as_aware(remind_at).timestamp()
+        with self._lock:
+            self._scheduled[reminder_id] = ts
+            if self._touched is not None:
+                self._touched[reminder_id] = ts
+            heapq.heappush(self._heap, (ts, reminder_id))
+            is_next = self._heap[0] == (ts, reminder_id)
+        if is_next:
+            self._wake.set()
+
+    def unschedule(self, reminder_id: int):
+        # the heap entry is dropped lazily when it reaches the top
+        with self._lock:
+            self._scheduled.pop(reminder_id, None)
+            if self._touched is not None:
+                self._touched[reminder_id] = None
+
+    def reconcile(self):
+        with self._lock:
+            self._touched = {}
+        try:
+            db = SessionLocal()
+            try:
+                pending = crud.list_pending_reminders(db)
+                scheduled = {r.id: _as_aware(r.remind_at).timestamp() for r in pending}
+            finally:
+                db.close()
+            with self._lock:
+                # the snapshot may predate writes that hooks already applied; keep those
+                for rid, ts in self._touched.items():
+                    if ts is None:
+                        scheduled.pop(rid, None)
+                    else:
+                        scheduled[rid] = ts
+                self._scheduled = scheduled
+                self._heap = [(ts, rid) for rid, ts in scheduled.items()]
+                heapq.heapify(self._heap)
+        finally:
+            with self._lock:
+                self._touched = None
+        self._last_reconcile = time.monotonic()
+        print(f"[scheduler] reconciled {len(scheduled)} pending reminders")
+
+    def _pop_due(self, now_ts: float) -> int:
+        """Drop due and stale entries from the heap; return how many were due."""
+        due = 0
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now_ts:
+                ts, rid = heapq.heappop(self._heap)
+                if self._scheduled.get(rid) == ts:
+                    del self._scheduled[rid]
+                    due += 1
+        return due
+
+    def _next_timeout(self, now_ts: float) -> float:
+        until_reconcile = self._last_reconcile + self.reconcile_interval - time.monotonic()
+        with self._lock:
+            while self._heap and self._scheduled.get(self._heap[0][1]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            until_next = self._heap[0][0] - now_ts if self._heap else until_reconcile
+        return max(0.0, min(until_next, until_reconcile))
+
+    def run(self):
+        print(f"[scheduler] Starting EventReminderWorker (reconcile={self.reconcile_interval}s)")
+        crud.add_listener(self.on_change)
+        try:
+            while not self._stop.is_set():
+                try:
+                    if time.monotonic() - self._last_reconcile >= self.reconcile_interval:
+                        self.reconcile()
+                    now = datetime.now(IST)
+                    if self._pop_due(now.timestamp()):
+                        self.process_due(now)
+                    timeout = self._next_timeout(datetime.now(IST).timestamp())
+                except Exception as e:
+                    print(f"[scheduler] error: {e}")
+                    timeout = CHECK_INTERVAL_SECONDS
+                self._wake.wait(timeout)
+                self._wake.clear()
+        finally:
+            crud.remove_listener(self.on_change)
+
+    def stop(self):
+        super().stop()
+        self._wake.set()
+
+
 # start worker automatically if module imported in the main process
 _worker: Optional[ReminderWorker] = None
 
 def start_scheduler_if_needed():
     global _worker
     if _worker is None:
-        _worker = ReminderWorker()
+        _worker = EventReminderWorker() if SCHED_MODE == "event" else ReminderWorker()
         _worker.start()
 
-# You can call start_scheduler_if_needed() from your app startup
+def stop_scheduler(timeout: float = 5.0):
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker.join(timeout)
+        _worker = None
 
+# You can call start_scheduler_if_needed() from your app startup
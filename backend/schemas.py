@@ -1,6 +1,6 @@
 # backend/schemas.py
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Literal, Optional, List
+from pydantic import BaseModel, Field
 from datetime import datetime
 
 class ReminderBase(BaseModel):
@@ -29,13 +29,45 @@ class TaskBase(BaseModel):
 class TaskCreate(TaskBase):
     pass
 
+TaskStatus = Literal["pending", "done"]  # models.Task.status
+
 class TaskUpdate(BaseModel):
-    title: Optional[str]
-    description: Optional[str]
-    due_datetime: Optional[datetime]
-    status: Optional[str]
-    priority: Optional[int]
-    tags: Optional[str]
+    # all optional: only the fields sent are changed
+    title: Optional[str] = None
+    description: Optional[str] = None
+    due_datetime: Optional[datetime] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[int] = None
+    tags: Optional[str] = None
+
+TASK_BULK_MAX = 10000
+
+class TaskBulkItem(BaseModel):
+    # no id: create (title required); with id: update only the fields present
+    id: Optional[int] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    due_datetime: Optional[datetime] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[int] = None
+    tags: Optional[str] = None
+
+class TaskBulkRequest(BaseModel):
+    tasks: List[TaskBulkItem] = Field(..., min_length=1, max_length=TASK_BULK_MAX)
+
+class TaskBulkResult(BaseModel):
+    created: List[int]  # new ids, ascending
+    updated: List[int]
+    reminders: int  # auto-reminders created
+    reminders_cancelled: int  # pending reminders of tasks updated to done
+
+class TaskStatusBulk(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=TASK_BULK_MAX)
+    status: TaskStatus = "done"
+
+class TaskStatusBulkResult(BaseModel):
+    updated: List[int]  # ascending
+    reminders_cancelled: int  # pending reminders of tasks marked done
 
 class TaskOut(TaskBase):
     id: int
@@ -47,6 +79,20 @@ class TaskOut(TaskBase):
     class Config:
         orm_mode = True
 
+class VoiceTaskResult(BaseModel):
+    text: str  # transcript
+    task: TaskOut
+    reminder: Optional[ReminderOut] = None
+    parser: str  # "local", "gemini" or "local-fallback"
+    audio_seconds: float
+    speech_seconds: float  # after VAD trimming
+    timings_ms: dict  # read, queue_wait, decode, vad, transcribe, extract, save, total
+
+class TaskPage(BaseModel):
+    items: List[TaskOut]
+    limit: int
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
+
 class NoteBase(BaseModel):
     title: Optional[str]
     content: str
@@ -59,10 +105,42 @@ class NoteOut(NoteBase):
     created_at: datetime
     updated_at: Optional[datetime]
     tags: Optional[str] = ""
+    tagging_status: Optional[str] = "done"
 
     class Config:
         orm_mode = True
 
+class NotePage(BaseModel):
+    items: List[NoteOut]
+    limit: int
+    next_cursor: Optional[str] = None
+
+class NoteCounts(BaseModel):
+    total: int
+    tagging_pending: int
+    tagging_failed: int
+
+class DashboardReminder(ReminderOut):
+    task_title: Optional[str] = None  # None for an orphaned reminder
+
+class Dashboard(BaseModel):
+    tasks: TaskPage
+    reminders: List[DashboardReminder]  # pending, soonest first
+    notes: NoteCounts
+
+class TaggingJob(BaseModel):
+    id: int
+    title: Optional[str]
+    tagging_status: str
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
+
+class TaggingJobs(BaseModel):
+    stats: dict
+    jobs: List[TaggingJob]
+
 # AI endpoints
 class AIQuery(BaseModel):
     prompt: str
@@ -71,3 +149,18 @@ class AIQuery(BaseModel):
 class AISummaryRequest(BaseModel):
     text: str
     max_length: Optional[int] = 120
+
+class AIBatchRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, max_length=1000)
+    max_length: Optional[int] = 120  # summarize only
+
+class AIBatchItem(BaseModel):
+    index: int  # position in the request's texts
+    ok: bool
+    tags: Optional[List[str]] = None
+    summary: Optional[str] = None
+    error: Optional[str] = None
+
+class AIBatchResponse(BaseModel):
+    results: List[AIBatchItem]
+    calls: int  # Gemini calls made for this request
@@ -0,0 +1,302 @@
+# backend/stt.py
+"""
+Speech-to-text for /stt.
+
+Uploads are read into memory under a size cap and decoded (PyAV, via
+faster-whisper's decode_audio) straight to the 16 kHz mono float32 array
+Whisper consumes, so no request touches the filesystem.
+
+Decoding and transcription are CPU-bound and hold the GIL for long stretches,
+so they run in a pool of STT_WORKERS processes, each with its own WhisperModel
+loaded once at worker start. A ConcurrencyLimiter in front of the pool admits at
+most one job per worker plus STT_MAX_QUEUE waiting ones (beyond that: 503),
+and each job gets STT_JOB_TIMEOUT seconds before the request gives up with 504.
+"""
+import asyncio
+import io
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+import numpy as np
+
+from backend.limiter import ConcurrencyLimiter
+
+SAMPLE_RATE = 16000
+STT_MAX_UPLOAD_BYTES = int(os.getenv("STT_MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+READ_CHUNK_BYTES = 64 * 1024
+
+VAD_PAD_SECONDS = 0.2  # audio kept around the detected speech so word edges aren't clipped
+
+STT_MODEL = os.getenv("STT_MODEL", "small")
+STT_WORKERS = int(os.getenv("STT_WORKERS", "2"))
+STT_MAX_QUEUE = int(os.getenv("STT_MAX_QUEUE", "8"))  # jobs allowed to wait for a free worker
+STT_JOB_TIMEOUT = float(os.getenv("STT_JOB_TIMEOUT", "120"))  # seconds, queue wait included
+# split the cores between workers instead of every model grabbing all of them
+STT_CPU_THREADS = int(os.getenv("STT_CPU_THREADS", str(max(1, (os.cpu_count() or 1) // max(STT_WORKERS, 1)))))
+
+
+class UploadTooLarge(ValueError):
+    def __init__(self, limit: int):
+        super().__init__(f"audio upload exceeds {limit} bytes")
+        self.limit = limit
+
+
+class STTTimeout(TimeoutError):
+    def __init__(self, timeout: float):
+        super().__init__(f"transcription did not finish within {timeout:.0f}s")
+        self.timeout = timeout
+
+
+def check_content_length(headers, max_bytes: int = STT_MAX_UPLOAD_BYTES):
+    """Reject up front when the client declares a body over the cap."""
+    length = headers.get("content-length")
+    if length is not None and length.isdigit() and int(length) > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+
+async def read_body(request, max_bytes: int = STT_MAX_UPLOAD_BYTES) -> bytes:
+    """The raw request body, aborting as soon as it grows past `max_bytes`."""
+    buf = bytearray()
+    async for chunk in request.stream():
+        buf += chunk
+        if len(buf) > max_bytes:
+            raise UploadTooLarge(max_bytes)
+    return bytes(buf)
+
+
+async def read_multipart_file(request, field: str = "file", max_bytes: int = STT_MAX_UPLOAD_BYTES) -> Optional[bytes]:
+    """
+    The `field` part of a multipart/form-data body, parsed as the body streams
+    in and kept in memory. Unlike request.form(), nothing is spooled to a temp
+    file, and reading stops as soon as the part outgrows `max_bytes` (or the
+    whole body outgrows it plus a chunk of room for the other fields and
+    boundaries). None if there is no such part.
+    """
+    try:
+        from python_multipart.multipart import MultipartParser, parse_options_header
+    except ImportError:  # python-multipart < 0.0.13
+        from multipart.multipart import MultipartParser, parse_options_header
+
+    _, options = parse_options_header(request.headers.get("content-type", ""))
+    boundary = options.get(b"boundary")
+    if not boundary:
+        raise ValueError("multipart body without a boundary")
+
+    headers, name, value = {}, bytearray(), bytearray()
+    part = {"name": None}
+    found = []  # the first `field` part's bytes, filled in as it arrives
+
+    def on_part_begin():
+        headers.clear()
+        part["name"] = None
+
+    def on_header_field(data, start, end):
+        name.extend(data[start:end])
+
+    def on_header_value(data, start, end):
+        value.extend(data[start:end])
+
+    def on_header_end():
+        headers[bytes(name).lower()] = bytes(value)
+        name.clear()
+        value.clear()
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(headers.get(b"content-disposition", b""))
+        part["name"] = disposition.get(b"name", b"").decode("latin-1")
+        if part["name"] == field and not found:
+            found.append(bytearray())
+        elif part["name"] == field:
+            part["name"] = None  # only the first one counts
+
+    def on_part_data(data, start, end):
+        if part["name"] == field:
+            found[0].extend(data[start:end])
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+    })
+    total = 0
+    async for chunk in request.stream():
+        total += len(chunk)
+        if total > max_bytes + READ_CHUNK_BYTES:
+            raise UploadTooLarge(max_bytes)
+        parser.write(chunk)
+        if found and len(found[0]) > max_bytes:
+            raise UploadTooLarge(max_bytes)
+    parser.finalize()
+    return bytes(found[0]) if found else None
+
+
+def decode_audio_bytes(data: bytes) -> np.ndarray:
+    """Any container/codec PyAV understands -> 16 kHz mono float32 samples."""
+    from faster_whisper.audio import decode_audio
+
+    return decode_audio(io.BytesIO(data), sampling_rate=SAMPLE_RATE)
+
+
+# --- worker process side ---
+# faster-whisper (ctranslate2, PyAV) is only imported here, in the workers;
+# the API process never pays for it
+_worker_model = None
+
+def _init_worker(model_size: str, cpu_threads: int):
+    global _worker_model
+    from faster_whisper import WhisperModel
+
+    _worker_model = WhisperModel(model_size, device="cpu", compute_type="int8", cpu_threads=cpu_threads)
+
+def _ping() -> bool:
+    return _worker_model is not None
+
+def trim_silence(audio: np.ndarray, pad_seconds: float = VAD_PAD_SECONDS) -> np.ndarray:
+    """Cut leading/trailing non-speech (Silero VAD); empty when there is no speech at all."""
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    spans = get_speech_timestamps(audio, VadOptions(min_silence_duration_ms=500))
+    if not spans:
+        return audio[:0]
+    pad = int(pad_seconds * SAMPLE_RATE)
+    return audio[max(spans[0]["start"] - pad, 0) : min(spans[-1]["end"] + pad, len(audio))]
+
+def _transcribe_job(data: bytes, submitted_at: float, vad: bool = False) -> dict:
+    started = time.time()
+    audio = decode_audio_bytes(data)
+    decoded = time.time()
+    speech = trim_silence(audio) if vad else audio
+    trimmed = time.time()
+    text = ""
+    if len(speech):
+        segments, _ = _worker_model.transcribe(speech)
+        text = " ".join(segment.text for segment in segments).strip()
+    finished = time.time()
+    return {
+        "text": text,
+        "queue_wait": started - submitted_at,
+        "run_seconds": finished - started,
+        "decode_seconds": decoded - started,
+        "vad_seconds": trimmed - decoded,
+        "transcribe_seconds": finished - trimmed,
+        "audio_seconds": len(audio) / SAMPLE_RATE,
+        "speech_seconds": len(speech) / SAMPLE_RATE,
+    }
+
+
+# --- API process side ---
+class STTPool:
+    def __init__(
+        self,
+        workers: int = STT_WORKERS,
+        max_queue: int = STT_MAX_QUEUE,
+        timeout: float = STT_JOB_TIMEOUT,
+        model_size: str = STT_MODEL,
+        cpu_threads: int = STT_CPU_THREADS,
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self.model_size = model_size
+        self.cpu_threads = cpu_threads
+        self.limiter = ConcurrencyLimiter("stt", max_inflight=workers, max_waiting=max_queue)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=500)  # recent queue waits (seconds), for percentiles
+        self.stats = {"completed": 0, "failed": 0, "timeouts": 0, "audio_seconds": 0.0, "run_seconds": 0.0}
+
+    def start(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    # spawn: don't fork the API process (threads, sockets) into workers
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_size, self.cpu_threads),
+                )
+                # workers start on demand; one no-op job each makes them load the model now
+                for _ in range(self.workers):
+                    self._pool.submit(_ping)
+                print(f"[stt] started {self.workers} whisper workers (model={self.model_size}, cpu_threads={self.cpu_threads})")
+        return self._pool
+
+    def stop(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    async def transcribe(self, data: bytes, vad: bool = False) -> dict:
+        """
+        Transcribe encoded audio in a worker, optionally trimming silence first.
+        Raises LimiterFull when saturated, STTTimeout after `timeout`.
+        """
+        submitted_at = time.time()
+        await self.limiter.acquire()
+        try:
+            fut = asyncio.wrap_future(self.start().submit(_transcribe_job, data, submitted_at, vad))
+        except BrokenProcessPool:
+            self.limiter.release()
+            self.stop()  # a worker died (OOM?): next call gets a fresh pool
+            raise
+        except BaseException:
+            self.limiter.release()
+            raise
+        # a worker can't be interrupted mid-job, so its slot is only freed when
+        # the job really ends, even if the request already timed out
+        fut.add_done_callback(self._job_done)
+        remaining = self.timeout - (time.time() - submitted_at)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(fut), max(remaining, 0.001))
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise STTTimeout(self.timeout) from None
+        except BrokenProcessPool:
+            self.stats["failed"] += 1
+            self.stop()
+            raise
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        self.stats["completed"] += 1
+        self.stats["audio_seconds"] += result["audio_seconds"]
+        self.stats["run_seconds"] += result["run_seconds"]
+        self._waits.append(result["queue_wait"])
+        return result
+
+    def _job_done(self, fut: asyncio.Future):
+        self.limiter.release()
+        if not fut.cancelled():
+            fut.exception()  # a timed-out job's error has no reader left; mark it retrieved
+
+    def snapshot(self) -> dict:
+        waits = np.array(self._waits) if self._waits else None
+        return {
+            **self.stats,
+            **self.limiter.stats(),
+            "queue_wait_p50": round(float(np.percentile(waits, 50)), 3) if waits is not None else None,
+            "queue_wait_p95": round(float(np.percentile(waits, 95)), 3) if waits is not None else None,
+            "queue_wait_max": round(float(waits.max()), 3) if waits is not None else None,
+        }
+
+
+_pool: Optional[STTPool] = None
+
+def get_pool() -> STTPool:
+    global _pool
+    if _pool is None:
+        _pool = STTPool()
+    return _pool
+
+def stop_pool():
+    if _pool is not None:
+        _pool.stop()
@@ -0,0 +1,192 @@
+# backend/tagging.py
+"""
+Background auto-tagging for notes.
+
+POST /notes saves the note straight away with tagging_status="pending"; the
+note_created write hook hands its id to this module's job queue, and a small
+pool of worker threads asks Gemini for tags and stores them (status "done").
+Failed calls are retried with backoff; after TAGGING_MAX_RETRIES the note is
+marked "failed" and keeps no tags. A sweeper re-queues pending notes that never
+made it into the queue (queue full, process restarted).
+"""
+import os
+import queue
+import threading
+from typing import Optional
+
+import backend.crud as crud
+from backend.ai import GeminiWrapper
+from backend.database import SessionLocal
+from backend.http_client import CircuitOpenError, backoff_delay
+
+TAGGING_WORKERS = int(os.getenv("TAGGING_WORKERS", "2"))
+TAGGING_QUEUE_SIZE = int(os.getenv("TAGGING_QUEUE_SIZE", "1000"))
+TAGGING_MAX_RETRIES = int(os.getenv("TAGGING_MAX_RETRIES", "3"))
+TAGGING_SWEEP_SECONDS = int(os.getenv("TAGGING_SWEEP_SECONDS", "60"))
+
+
+class TaggingQueue:
+    def __init__(
+        self,
+        workers: int = TAGGING_WORKERS,
+        queue_size: int = TAGGING_QUEUE_SIZE,
+        max_retries: int = TAGGING_MAX_RETRIES,
+        sweep_seconds: int = TAGGING_SWEEP_SECONDS,
+        wrapper: Optional[GeminiWrapper] = None,
+    ):
+        self.workers = workers
+        self.max_retries = max_retries
+        self.sweep_seconds = sweep_seconds
+        self.wrapper = wrapper or GeminiWrapper(model="gemini-2.0-flash")
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._queued = set()  # note ids waiting or in progress, so the sweeper doesn't double-queue
+        self._lock = threading.Lock()
+        self._threads = []
+        self._stop = threading.Event()
+        self.stats = {"enqueued": 0, "tagged": 0, "failed": 0, "dropped": 0, "retried": 0}
+
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        crud.add_listener(self._on_write)
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"tagging-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        sweeper = threading.Thread(target=self._sweep_loop, name="tagging-sweeper", daemon=True)
+        sweeper.start()
+        self._threads.append(sweeper)
+        print(f"[tagging] started {self.workers} tagging workers")
+
+    def stop(self, timeout: float = 5.0):
+        crud.remove_listener(self._on_write)
+        self._stop.set()
+        # sentinels only wake idle workers; with a full queue none is idle, and
+        # busy ones see _stop on their next get. Notes left queued stay pending.
+        for _ in range(self.workers):
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                break
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def enqueue(self, note_id: int) -> bool:
+        """Queue a note for tagging. Returns False if it is already queued or the queue is full."""
+        with self._lock:
+            if note_id in self._queued:
+                return False
+            try:
+                self._queue.put_nowait(note_id)
+            except queue.Full:
+                # stays pending in the DB; the sweeper picks it up later
+                self.stats["dropped"] += 1
+                return False
+            self._queued.add(note_id)
+            self.stats["enqueued"] += 1
+            return True
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {**self.stats, "queued": len(self._queued), "workers": self.workers}
+
+    def _on_write(self, event: str, obj_id: int, obj=None):
+        if event == "note_created" and obj is not None and obj.tagging_status == "pending":
+            self.enqueue(obj_id)
+
+    def sweep(self) -> int:
+        """Queue every pending note in the DB that isn't queued yet."""
+        db = SessionLocal()
+        try:
+            ids = [n.id for n in crud.list_notes_by_tagging_status(db, ["pending"])]
+        finally:
+            db.close()
+        return sum(self.enqueue(note_id) for note_id in ids)
+
+    def _sweep_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"[tagging] sweep failed: {e}")
+            self._stop.wait(self.sweep_seconds)
+
+    def _run(self):
+        while True:
+            note_id = self._queue.get()
+            try:
+                if note_id is None or self._stop.is_set():
+                    return
+                self._tag(note_id)
+            except Exception as e:
+                print(f"[tagging] unexpected error on note {note_id}: {e}")
+            finally:
+                with self._lock:
+                    self._queued.discard(note_id)
+                self._queue.task_done()
+
+    def _tag(self, note_id: int):
+        db = SessionLocal()
+        try:
+            note = crud.get_note(db, note_id)
+            if note is None or note.tagging_status != "pending":
+                return
+            content = note.content
+        finally:
+            # don't hold a connection for the length of the Gemini call
+            db.close()
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                tags = self.wrapper.categorize(content)
+                break
+            except CircuitOpenError as e:
+                error, delay = e, e.retry_after
+            except Exception as e:
+                error, delay = e, backoff_delay(attempt)
+            if self._stop.is_set():
+                return  # shutting down: leave it pending for the sweeper after restart
+            if attempt < self.max_retries:
+                self._count("retried")
+                self._stop.wait(delay)
+        else:
+            print(f"[tagging] giving up on note {note_id} after {self.max_retries + 1} attempts: {error}")
+            self._save(note_id, "", "failed")
+            self._count("failed")
+            return
+        self._save(note_id, ", ".join(tags), "done")
+        self._count("tagged")
+
+    def _save(self, note_id: int, tags: str, status: str):
+        db = SessionLocal()
+        try:
+            crud.set_note_tags(db, note_id, tags, status)
+        finally:
+            db.close()
+
+
+_tagger: Optional[TaggingQueue] = None
+_tagger_lock = threading.Lock()
+
+def get_tagger() -> TaggingQueue:
+    global _tagger
+    with _tagger_lock:
+        if _tagger is None:
+            _tagger = TaggingQueue()
+    return _tagger
+
+def start_tagging():
+    get_tagger().start()
+
+def stop_tagging():
+    if _tagger is not None:
+        _tagger.stop()
@@ -34,16 +34,20 @@ load_dotenv()
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
-def notify_telegram(title: str, body: str):
+def telegram_payload(title: str, body: str, chat_id=None) -> dict:
     message = f"📌 *{title}*\n\n{body}"
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    payload = {
-        "chat_id": TELEGRAM_CHAT_ID,
+    return {
+        "chat_id": chat_id or TELEGRAM_CHAT_ID,
         "text": message,
         "parse_mode": "Markdown"
     }
+
+def notify_telegram(title: str, body: str):
+    """Synchronous one-off send. The scheduler goes through backend.notifier instead."""
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    payload = telegram_payload(title, body)
     try:
-        response = requests.post(url, json=payload)
+        response = requests.post(url, json=payload, timeout=10)
         response.raise_for_status()
     except Exception as e:
         print("Telegram notification failed:", e)
@@ -0,0 +1,77 @@
+# backend/versions.py
+"""
+Per-collection versions for conditional GETs (ETag / If-None-Match).
+
+Every crud write hook advances the version of the collection it touched
+(tasks, notes, reminders; deleting a task also touches reminders, which
+cascade). A list endpoint's ETag is derived from the versions it depends on
+plus the request's query string, so a client that sends it back gets a 304
+without the rows being queried or serialized.
+
+Versions live in this process, like the retrieval index and the scheduler
+heap, so writes made by another process (a separate scheduler/tagging worker)
+aren't seen. To bound that, and the time-dependent today/overdue filters,
+ETags also roll over every ETAG_MAX_AGE_SECONDS.
+"""
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+import backend.crud as crud
+
+ETAG_MAX_AGE_SECONDS = int(os.getenv("ETAG_MAX_AGE_SECONDS", "30"))
+
+COLLECTIONS = ("tasks", "notes", "reminders")
+_versions = dict.fromkeys(COLLECTIONS, 0)
+_lock = threading.Lock()
+_epoch = uuid.uuid4().hex  # a restarted process never reissues an old validator
+
+_EVENT_COLLECTIONS = {
+    "task": ("tasks",),
+    "note": ("notes",),
+    "reminder": ("reminders",),
+}
+
+
+def bump(*collections: str):
+    with _lock:
+        for name in collections:
+            _versions[name] += 1
+
+
+def version(name: str) -> int:
+    return _versions[name]
+
+
+def _on_write(event: str, obj_id: int, obj=None):
+    touched = _EVENT_COLLECTIONS.get(event.split("_", 1)[0], ())
+    if event == "task_deleted":
+        touched += ("reminders",)  # ON DELETE CASCADE
+    bump(*touched)
+
+
+def etag(*collections: str, variant: str = "") -> str:
+    """Weak validator for a response built from `collections`; `variant` is e.g. the query string."""
+    window = int(time.time() // ETAG_MAX_AGE_SECONDS) if ETAG_MAX_AGE_SECONDS > 0 else 0
+    with _lock:
+        state = ",".join(f"{name}={_versions[name]}" for name in collections)
+    digest = hashlib.sha1(f"{_epoch}|{window}|{state}|{variant}".encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def matches(if_none_match: str, tag: str) -> bool:
+    """If-None-Match comparison (weak, so W/ prefixes are ignored)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = tag[2:] if tag.startswith("W/") else tag
+    return any(
+        (candidate[2:] if candidate.startswith("W/") else candidate) == opaque
+        for candidate in (c.strip() for c in if_none_match.split(","))
+    )
+
+
+crud.add_listener(_on_write)
@@ -0,0 +1,222 @@
+# backend/voice_parser.py
+"""
+Local, deterministic parsing of spoken task requests.
+
+Most utterances are simple ("remind me to call Ravi tomorrow at 6pm"), and a
+Gemini round trip to split them into title/due/priority costs seconds. This
+parser handles the common shapes with regexes and plain date arithmetic:
+
+- filler like "remind me to", "please", "don't forget to" is stripped;
+- the due date/time is read from relative days (today, tomorrow, friday,
+  next monday, in 2 hours), calendar dates ("5th march", via one cached
+  dateparser instance) and times ("at 6pm", "18:30", "evening");
+- priority keywords ("urgent", "low priority") set the priority.
+
+It also returns a confidence score. Anything that looks temporal but wasn't
+understood, an empty title, or a long multi-clause utterance lowers it, and
+the caller sends those to Gemini instead (VOICE_PARSE_THRESHOLD).
+"""
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+import pytz
+
+IST = pytz.timezone("Asia/Kolkata")
+
+VOICE_PARSE_THRESHOLD = float(os.getenv("VOICE_PARSE_THRESHOLD", "0.75"))
+DEFAULT_HOUR = 9  # due time when only a day is given
+
+# one parser, built once: dateparser re-reads its settings and language data per parse() call otherwise
+DATEPARSER_SETTINGS = {"TIMEZONE": "Asia/Kolkata", "RETURN_AS_TIMEZONE_AWARE": True, "PREFER_DATES_FROM": "future"}
+_date_parser = None
+_date_parser_lock = threading.Lock()
+
+def _get_date_parser():
+    global _date_parser
+    with _date_parser_lock:
+        if _date_parser is None:
+            from dateparser.date import DateDataParser
+
+            _date_parser = DateDataParser(languages=["en"], settings=DATEPARSER_SETTINGS)
+    return _date_parser
+
+
+_FILLER_RE = re.compile(
+    r"^(?:(?:hey|ok(?:ay)?|so|um+|uh+)[\s,]+)*"
+    r"(?:please\s+)?"
+    r"(?:(?:can|could|would) you\s+)?"
+    r"(?:please\s+)?"
+    r"(?:remind me (?:to|that i (?:need|have) to|about)|set (?:a|an) (?:reminder|alarm) (?:to|for)|"
+    r"add (?:a )?task (?:to)?|create (?:a )?task (?:to)?|don'?t (?:let me )?forget to|do not forget to|"
+    r"i (?:need|have|want|got) to|i must|i should|need to|have to|make sure (?:to|i)|task:?)?\s*",
+    re.I,
+)
+_TRAILING_FILLER_RE = re.compile(r"[\s,]*(?:please|thanks|thank you|ok(?:ay)?)?[\s.!?,]*$", re.I)
+
+_PRIORITY_WORDS = [
+    (re.compile(r"\b(?:high priority|top priority|urgent(?:ly)?|asap|as soon as possible|important|critical)\b", re.I), 1),
+    (re.compile(r"\b(?:low priority|no rush|whenever|someday|not urgent|if (?:i|you) have time)\b", re.I), 3),
+    (re.compile(r"\b(?:medium priority|normal priority)\b", re.I), 2),
+]
+
+_WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+_MONTHS = r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+_PARTS_OF_DAY = {"morning": 9, "noon": 12, "afternoon": 15, "evening": 18, "tonight": 20, "night": 20, "midnight": 0}
+
+_DAY_RE = re.compile(
+    r"\b(?:(?P<rel>today|tonight|tomorrow|tmrw|day after tomorrow)"
+    r"|(?:(?:on|this|next|coming)\s+)?(?P<weekday>" + "|".join(_WEEKDAYS) + r")"
+    r"|(?:on\s+)?(?P<cal>\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?(?:" + _MONTHS + r")|(?:" + _MONTHS + r")\s+\d{1,2}(?:st|nd|rd|th)?)"
+    r"|(?:on\s+)?(?P<iso>\d{4}-\d{2}-\d{2}))\b",
+    re.I,
+)
+_IN_RE = re.compile(r"\b(?:in|after)\s+(?P<n>\d+|an?|one|two|three|half an?)\s+(?P<unit>min(?:ute)?s?|hours?|hrs?|days?|weeks?)\b", re.I)
+_TIME_RE = re.compile(
+    r"\b(?:(?:at|by|before|around)\s+)?(?P<h>\d{1,2})(?::(?P<m>\d{2}))?\s*(?P<ampm>a\.?m\.?|p\.?m\.?)(?=\W|$)"
+    r"|\b(?:at|by|before|around)\s+(?P<h24>\d{1,2})(?::(?P<m24>\d{2}))?(?:\s*o'?clock)?\b"
+    r"|\b(?P<hhmm>[01]?\d|2[0-3]):(?P<mm>[0-5]\d)\b"
+    r"|\b(?:in the\s+|this\s+|at\s+)?(?P<part>morning|noon|afternoon|evening|tonight|night|midnight)\b",
+    re.I,
+)
+_NUMBER_WORDS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3}
+# temporal-looking words left over after extraction mean we probably misread the date
+_TEMPORAL_HINT_RE = re.compile(
+    r"\b(?:\d+|" + _MONTHS + r"|" + "|".join(_WEEKDAYS) + r"|week(?:end)?s?|fortnight|months?|years?|later|soon|eod|end of|"
+    r"o'?clock|hours?|minutes?|days?|tomorrow|today|tonight|yesterday|every|daily|weekly)\b",
+    re.I,
+)
+_MULTI_TASK_RE = re.compile(r"\b(?:and then|and also|also|after that|then)\b", re.I)
+
+
+def _strip_span(text: str, match) -> str:
+    return (text[: match.start()] + " " + text[match.end():]).strip()
+
+
+def _resolve_day(m, now: datetime) -> Optional[datetime]:
+    rel, weekday, cal, iso = (m.group("rel") or "").lower(), m.group("weekday"), m.group("cal"), m.group("iso")
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    if rel in ("today", "tonight"):
+        return today
+    if rel in ("tomorrow", "tmrw"):
+        return today + timedelta(days=1)
+    if rel == "day after tomorrow":
+        return today + timedelta(days=2)
+    if weekday:
+        ahead = (_WEEKDAYS.index(weekday.lower()) - today.weekday()) % 7
+        if ahead == 0 and m.group(0).lower().startswith("next"):
+            ahead = 7
+        return today + timedelta(days=ahead)
+    if iso:
+        try:
+            return IST.localize(datetime.strptime(iso, "%Y-%m-%d"))
+        except ValueError:
+            return None
+    data = _get_date_parser().get_date_data(re.sub(r"(?<=\d)(st|nd|rd|th)\b", "", cal, flags=re.I))
+    if data.date_obj is None:
+        return None
+    return data.date_obj.astimezone(IST).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _resolve_time(m) -> Optional[Tuple[int, int]]:
+    if m.group("part"):
+        return _PARTS_OF_DAY[m.group("part").lower()], 0
+    if m.group("hhmm"):
+        return int(m.group("hhmm")), int(m.group("mm"))
+    if m.group("h24"):
+        hour, minute = int(m.group("h24")), int(m.group("m24") or 0)
+        if hour > 23 or minute > 59:
+            return None
+        # "at 6" means 6pm for most tasks people dictate; 7..11 stay morning
+        if 1 <= hour <= 6:
+            hour += 12
+        return hour, minute
+    hour, minute = int(m.group("h")), int(m.group("m") or 0)
+    if not 1 <= hour <= 12 or minute > 59:
+        return None
+    pm = m.group("ampm").lower().startswith("p")
+    return hour % 12 + (12 if pm else 0), minute
+
+
+def parse_voice(text: str, now: Optional[datetime] = None) -> Tuple[dict, float]:
+    """
+    (task_details, confidence) for an utterance. task_details has the same keys
+    the Gemini path produces: title, description, due_datetime (ISO, IST), priority, tags.
+    """
+    now = now.astimezone(IST) if now is not None else datetime.now(IST)
+    confidence = 0.95
+    rest = re.sub(r"\s+", " ", text or "").strip()
+
+    priority = 2
+    for pattern, level in _PRIORITY_WORDS:
+        m = pattern.search(rest)
+        if m:
+            priority = level
+            rest = _strip_span(rest, m)
+            break
+
+    due = None
+    m = _IN_RE.search(rest)
+    if m:
+        n = m.group("n").lower()
+        amount = 0.5 if n.startswith("half") else _NUMBER_WORDS.get(n) or int(n)
+        unit = m.group("unit").lower()
+        delta = {"m": timedelta(minutes=amount), "h": timedelta(hours=amount), "d": timedelta(days=amount), "w": timedelta(weeks=amount)}[unit[0]]
+        due = (now + delta).replace(second=0, microsecond=0)
+        rest = _strip_span(rest, m)
+    else:
+        day, clock, rollover = None, None, timedelta(days=1)
+        m = _DAY_RE.search(rest)
+        if m:
+            day = _resolve_day(m, now)
+            # a time already past on "today" or "monday" (said on a monday) means the
+            # next one, like dateparser's PREFER_DATES_FROM=future; explicit dates stay
+            rel = (m.group("rel") or "").lower()
+            rollover = timedelta(days=1) if rel in ("today", "tonight") else timedelta(weeks=1) if m.group("weekday") else None
+            if day is None:
+                confidence -= 0.5
+            elif m.group("rel") and m.group("rel").lower() == "tonight":
+                clock = (_PARTS_OF_DAY["tonight"], 0)
+            rest = _strip_span(rest, m)
+        m = _TIME_RE.search(rest)
+        if m:
+            parsed_clock = _resolve_time(m)
+            if parsed_clock is None:
+                confidence -= 0.5
+            else:
+                clock = parsed_clock
+            rest = _strip_span(rest, m)
+        if day is not None or clock is not None:
+            hour, minute = clock if clock is not None else (DEFAULT_HOUR, 0)
+            base = day if day is not None else now.replace(hour=0, minute=0, second=0, microsecond=0)
+            due = IST.localize(datetime(base.year, base.month, base.day, hour, minute))
+            if due <= now and rollover is not None:
+                due += rollover  # "at 6pm" said at 8pm means tomorrow
+            if day is not None and clock is None:
+                confidence -= 0.1
+
+    rest = _FILLER_RE.sub("", rest, count=1)
+    rest = _TRAILING_FILLER_RE.sub("", rest)
+    rest = re.sub(r"\s+", " ", re.sub(r"\s+([,.!?])", r"\1", rest)).strip(" ,.:;-")
+    # connectors left dangling where the date was cut out ("call Ravi on", "pay rent by")
+    title = re.sub(r"\s+(?:on|at|by|for|before|around|in|the)$", "", rest, flags=re.I).strip(" ,.:;-")
+
+    if len(title) < 2:
+        confidence = 0.0
+    if _TEMPORAL_HINT_RE.search(title):
+        confidence -= 0.5  # something date-like we didn't understand is still in the title
+    if _MULTI_TASK_RE.search(title):
+        confidence -= 0.3
+    if len(title.split()) > 12:
+        confidence -= 0.3
+
+    details = {
+        "title": title[:1].upper() + title[1:] if title else text,
+        "description": "Created via voice",
+        "due_datetime": due.isoformat() if due is not None else None,
+        "priority": priority,
+        "tags": "voice",
+    }
+    return details, max(0.0, round(confidence, 2))
@@ -0,0 +1,188 @@
+# benchmarks/bench_async_db.py
+"""
+Throughput of the async DB handlers against the previous sync/threadpool path,
+at increasing client concurrency.
+
+    python benchmarks/bench_async_db.py --concurrency 10 100 500 --seconds 10
+
+Starts one uvicorn process at a time on a seeded SQLite file:
+  async  backend.app:app (async handlers on the aiosqlite engine)
+  sync   sync_app below: the same routes written the old way, sync handlers
+         with a SessionLocal per request, run in Starlette's threadpool
+and drives each with an httpx client: 70% GET /tasks?limit=20, 20% GET
+/tasks/{id}, 10% POST /tasks. Background components are switched off.
+
+Past ~40 concurrent requests the sync path stalls rather than just slowing
+down: every threadpool thread waits for a pooled connection, and the get_db
+teardown that would return one needs a thread too, so requests fail with pool
+timeouts. Server errors are counted, not printed.
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if __name__ == "__main__":
+    _tmpdir = tempfile.mkdtemp(prefix="taskai-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+sys.path.insert(0, ROOT)
+
+from typing import Optional
+
+from fastapi import Depends, FastAPI, HTTPException, Query
+from sqlalchemy.orm import Session
+
+import backend.crud as crud
+import backend.models as models
+import backend.schemas as schemas
+from backend.database import SessionLocal, engine, init_db
+
+# --- the sync path, as the handlers were before the async engine ---
+sync_app = FastAPI()
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@sync_app.post("/tasks", response_model=schemas.TaskOut)
+def sync_create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
+    return crud.create_task(db, task)
+
+@sync_app.get("/tasks", response_model=schemas.TaskPage)
+def sync_list_tasks(
+    filter_by: Optional[str] = Query(None, alias="filter"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    items, next_cursor = crud.list_tasks_page(db, filter_by=filter_by, limit=limit, cursor=cursor)
+    return {"items": items, "limit": limit, "next_cursor": next_cursor}
+
+@sync_app.get("/tasks/{task_id}", response_model=schemas.TaskOut)
+def sync_get_task(task_id: int, db: Session = Depends(get_db)):
+    t = crud.get_task(db, task_id)
+    if not t:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return t
+
+
+TARGETS = {"sync": "bench_async_db:sync_app", "async": "backend.app:app"}
+
+
+def seed(rows: int):
+    init_db()
+    with engine.begin() as conn:
+        conn.execute(
+            models.Task.__table__.insert(),
+            [{"title": f"task {i}", "status": "pending", "priority": 1 + i % 3, "tags": ""} for i in range(rows)],
+        )
+
+
+def start_server(target: str, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.path.join(ROOT, "benchmarks"), os.environ.get("PYTHONPATH")])),
+        RUN_MIGRATIONS="0", ENABLE_SCHEDULER="0", ENABLE_TAGGING="0", ENABLE_STT="0",
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", target, "--port", str(port), "--log-level", "warning", "--no-access-log"],
+        env=env, stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(base: str, timeout: float = 30):
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(f"{base}/tasks?limit=1")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base} did not come up")
+
+
+async def drive(base: str, concurrency: int, seconds: float, rows: int) -> dict:
+    import httpx
+
+    latencies, errors = [], 0
+    deadline = time.monotonic() + seconds
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async def user(client, rnd):
+        nonlocal errors
+        while time.monotonic() < deadline:
+            roll = rnd.random()
+            started = time.perf_counter()
+            try:
+                if roll < 0.7:
+                    r = await client.get("/tasks", params={"limit": 20})
+                elif roll < 0.9:
+                    r = await client.get(f"/tasks/{rnd.randint(1, rows)}")
+                else:
+                    r = await client.post("/tasks", json={"title": "load test"})
+                ok = r.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60) as client:
+        await asyncio.gather(*(user(client, random.Random(i)) for i in range(concurrency)))
+    return {"latencies": latencies, "errors": errors}
+
+
+def describe(result: dict, seconds: float) -> str:
+    import numpy as np
+
+    ms = np.array(result["latencies"]) * 1000
+    if not len(ms):
+        return f"no successful requests, {result['errors']} errors"
+    return (
+        f"{len(ms) / seconds:7.0f} req/s  p50 {np.percentile(ms, 50):7.1f}ms  p95 {np.percentile(ms, 95):7.1f}ms"
+        f"  p99 {np.percentile(ms, 99):7.1f}ms  errors {result['errors']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    base = f"http://127.0.0.1:{args.port}"
+    results = {}
+    for name, target in TARGETS.items():
+        server = start_server(target, args.port)
+        try:
+            asyncio.run(wait_ready(base))
+            for c in args.concurrency:
+                results[(name, c)] = asyncio.run(drive(base, c, args.seconds, args.rows))
+        finally:
+            server.terminate()
+            server.wait()
+
+    for c in args.concurrency:
+        print(f"\nconcurrency {c}:")
+        for name in TARGETS:
+            print(f"  {name:<6} {describe(results[(name, c)], args.seconds)}")
+
+
+if __name__ == "__main__":
+    main()
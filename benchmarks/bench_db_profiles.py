@@ -0,0 +1,139 @@
+# benchmarks/bench_db_profiles.py
+"""
+Mixed read/write load against each engine profile in backend/database.py.
+
+    python benchmarks/bench_db_profiles.py --readers 8 --writers 2 --seconds 10
+
+Reader threads page through /tasks the way the API does (list_tasks_page);
+writer threads create and update tasks, one commit each, like the scheduler
+and tagging workers do next to the API. Each profile gets a fresh SQLite file
+with --rows seeded tasks. With --url the same load runs against a scratch
+server database instead (its tables are dropped and recreated).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base, make_engine
+import backend.crud as crud
+import backend.models as models
+import backend.schemas as schemas
+
+PROFILES = ["default", "tuned"]
+
+
+def seed(engine, rows: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(
+            models.Task.__table__.insert(),
+            [
+                {"title": f"task {i}", "status": "pending", "priority": 1 + i % 3, "tags": "",
+                 "due_datetime": now + timedelta(minutes=i)}
+                for i in range(rows)
+            ],
+        )
+
+
+def run_load(engine, readers: int, writers: int, seconds: float) -> dict:
+    Session = sessionmaker(bind=engine, autoflush=False)
+    stop = threading.Event()
+    reads, writes, errors = [], [], []
+    lock = threading.Lock()
+
+    def reader():
+        own, cursor = [], None
+        while not stop.is_set():
+            db = Session()
+            started = time.perf_counter()
+            try:
+                _, cursor = crud.list_tasks_page(db, limit=50, cursor=cursor)
+                own.append(time.perf_counter() - started)
+            except Exception as e:
+                with lock:
+                    errors.append(type(e).__name__)
+            finally:
+                db.close()
+        with lock:
+            reads.extend(own)
+
+    def writer(n: int):
+        own = []
+        i = 0
+        while not stop.is_set():
+            db = Session()
+            started = time.perf_counter()
+            try:
+                task = crud.create_task(db, schemas.TaskCreate(title=f"w{n}-{i}", due_datetime=datetime.utcnow()))
+                crud.update_task(db, task.id, schemas.TaskUpdate(
+                    title=task.title, description=None, due_datetime=task.due_datetime,
+                    status="done", priority=task.priority, tags="",
+                ))
+                own.append(time.perf_counter() - started)
+            except Exception as e:
+                db.rollback()
+                with lock:
+                    errors.append(type(e).__name__)
+            finally:
+                db.close()
+            i += 1
+        with lock:
+            writes.extend(own)
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    return {"reads": np.array(reads) * 1000, "writes": np.array(writes) * 1000, "errors": errors}
+
+
+def describe(ms: np.ndarray) -> str:
+    if not len(ms):
+        return "none"
+    return f"p50 {np.percentile(ms, 50):6.1f}ms  p95 {np.percentile(ms, 95):6.1f}ms  p99 {np.percentile(ms, 99):7.1f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--url", help="scratch server database to use instead of SQLite files")
+    args = parser.parse_args()
+
+    tmpdir = tempfile.mkdtemp(prefix="taskai-bench-")
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per profile, {args.rows} seeded tasks")
+    for profile in PROFILES:
+        url = args.url or f"sqlite:///{os.path.join(tmpdir, profile + '.db')}"
+        engine = make_engine(url, profile)
+        seed(engine, args.rows)
+        result = run_load(engine, args.readers, args.writers, args.seconds)
+        engine.dispose()
+        reads, writes = result["reads"], result["writes"]
+        print(f"\n[{profile}]")
+        print(f"  reads : {len(reads) / args.seconds:8.0f}/s  {describe(reads)}")
+        print(f"  writes: {len(writes) / args.seconds:8.0f}/s  {describe(writes)}")
+        if result["errors"]:
+            kinds = {k: result["errors"].count(k) for k in set(result["errors"])}
+            print(f"  errors: {kinds}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_indexes.py
+"""
+Query latency of the hot read paths before and after the composite indexes
+from migration 0002, on a large SQLite database.
+
+    python benchmarks/bench_indexes.py --rows 1000000
+
+Seeds --rows tasks and --rows reminders at revision 0001 (primary keys only),
+times the queries, upgrades to head and times them again.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_tmpdir = tempfile.mkdtemp(prefix="taskai-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytz
+
+from backend.database import SessionLocal, engine, init_db
+import backend.crud as crud
+import backend.models as models
+
+IST = pytz.timezone("Asia/Kolkata")
+CHUNK = 50_000
+
+
+def seed(rows: int):
+    # mostly history: tasks spread over the last two years (nearly all done) plus
+    # the next month; reminders mostly in the future with a handful already due
+    rnd = random.Random(42)
+    now = datetime.utcnow()
+    now_ist = datetime.now(IST).replace(tzinfo=None)
+    with engine.begin() as conn:
+        for start in range(0, rows, CHUNK):
+            tasks, reminders = [], []
+            for i in range(start + 1, min(rows, start + CHUNK) + 1):
+                due = now + timedelta(minutes=rnd.randint(-2 * 365 * 24 * 60, 30 * 24 * 60))
+                done = due < now and rnd.random() < 0.99
+                tasks.append({
+                    "id": i, "title": f"task {i}", "due_datetime": due,
+                    "status": "done" if done else "pending", "priority": rnd.randint(1, 3), "tags": "",
+                })
+                due_now = rnd.random() < 0.001
+                remind_at = now_ist - timedelta(minutes=1) if due_now else now_ist + timedelta(minutes=rnd.randint(1, 365 * 24 * 60))
+                reminders.append({"task_id": i, "remind_at": remind_at, "notified": False})
+            conn.execute(models.Task.__table__.insert(), tasks)
+            conn.execute(models.Reminder.__table__.insert(), reminders)
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(repeat: int) -> dict:
+    db = SessionLocal()
+    try:
+        queries = {
+            "list_tasks(today)": lambda: crud.list_tasks(db, filter_by="today"),
+            "list_tasks(overdue)": lambda: crud.list_tasks(db, filter_by="overdue"),
+            "get_due_reminders": lambda: crud.get_due_reminders(db, datetime.now(IST)),
+        }
+        results = {}
+        for name, fn in queries.items():
+            rows = len(fn())
+            results[name] = (rows, timed(fn, repeat))
+            db.expunge_all()
+        return results
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    init_db("0001")
+    start = time.perf_counter()
+    seed(args.rows)
+    print(f"seeded {args.rows} tasks + {args.rows} reminders in {time.perf_counter() - start:.1f}s")
+    before = measure(args.repeat)
+
+    start = time.perf_counter()
+    init_db("head")
+    print(f"migrated to head (index build) in {time.perf_counter() - start:.1f}s")
+    after = measure(args.repeat)
+
+    print(f"{'query':<22} {'rows':>7} {'no index':>10} {'indexed':>10} {'speedup':>8}")
+    for name, (rows, t_before) in before.items():
+        t_after = after[name][1]
+        print(f"{name:<22} {rows:>7} {t_before * 1000:>8.1f}ms {t_after * 1000:>8.1f}ms {t_before / t_after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_reminder_drain.py
+"""
+Reminder drain throughput: per-reminder crud calls (the old scheduler loop)
+vs the batched drain in backend.scheduler.drain_due_reminders.
+
+    python benchmarks/bench_reminder_drain.py --reminders 5000
+
+Runs against a throwaway SQLite file; notifications are counted, not sent.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_tmpdir = tempfile.mkdtemp(prefix="taskai-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytz
+
+from backend.database import Base, SessionLocal, engine
+import backend.crud as crud
+import backend.models as models
+from backend.scheduler import drain_due_reminders
+
+IST = pytz.timezone("Asia/Kolkata")
+
+
+def seed(n: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    due = datetime.now(IST) - timedelta(minutes=1)
+    with engine.begin() as conn:
+        conn.execute(
+            models.Task.__table__.insert(),
+            [{"id": i, "title": f"task {i}", "status": "pending", "priority": 2, "tags": ""} for i in range(1, n + 1)],
+        )
+        conn.execute(
+            models.Reminder.__table__.insert(),
+            [{"task_id": i, "remind_at": due, "notified": False} for i in range(1, n + 1)],
+        )
+
+
+def drain_legacy(now: datetime, notify) -> int:
+    # the pre-batching ReminderWorker loop: ~5 round trips and 2 commits per reminder
+    db = SessionLocal()
+    sent = 0
+    try:
+        for r in crud.get_due_reminders(db, now):
+            task = crud.get_task(db, r.task_id)
+            title = task.title if task else f"Task #{r.task_id}"
+            notify(title, f"Reminder for task: {title} at {r.remind_at.strftime('%Y-%m-%d %I:%M %p')}")
+            crud.mark_reminder_notified(db, r.id)
+            crud.delete_reminder(db, r.id)
+            sent += 1
+    finally:
+        db.close()
+    return sent
+
+
+def run(name: str, drain, n: int):
+    seed(n)
+    notified = []
+    start = time.perf_counter()
+    sent = drain(datetime.now(IST), lambda title, body: notified.append(title))
+    elapsed = time.perf_counter() - start
+    assert sent == n == len(notified), (sent, n, len(notified))
+    print(f"{name:<10} {n:>7} reminders  {elapsed:8.3f}s  {n / elapsed:10.0f} reminders/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reminders", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    legacy = run("legacy", drain_legacy, args.reminders)
+    batched = run(
+        "batched",
+        lambda now, notify: drain_due_reminders(now, notify=notify, batch_size=args.batch_size),
+        args.reminders,
+    )
+    print(f"speedup: {legacy / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
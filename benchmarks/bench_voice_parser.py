@@ -0,0 +1,89 @@
+# benchmarks/bench_voice_parser.py
+"""
+How often the local voice parser lets /tasks/voice skip Gemini, and how often
+it is right when it does.
+
+    python benchmarks/bench_voice_parser.py [--threshold 0.75] [--verbose]
+
+Each line of fixtures/voice_utterances.jsonl is an utterance plus the task we
+expect ({"title", "due", "priority"}), or "expect": null for utterances the
+local parser should not claim (they must go to Gemini). Dates are resolved
+against a fixed "now" so the corpus doesn't age.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import voice_parser
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "voice_utterances.jsonl")
+NOW = voice_parser.IST.localize(datetime(2026, 10, 18, 11, 0))  # a Sunday
+
+
+def load(path: str):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def matches(details: dict, expect: dict) -> bool:
+    due = details["due_datetime"][:16] if details["due_datetime"] else None
+    return (
+        details["title"].lower() == expect["title"].lower()
+        and due == expect["due"]
+        and details["priority"] == expect["priority"]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--threshold", type=float, default=voice_parser.VOICE_PARSE_THRESHOLD)
+    parser.add_argument("--fixtures", default=FIXTURES)
+    parser.add_argument("--verbose", action="store_true", help="print every utterance")
+    args = parser.parse_args()
+
+    cases = load(args.fixtures)
+    started = time.perf_counter()
+    voice_parser._get_date_parser()  # one-time dateparser load, reported separately
+    warmup = time.perf_counter() - started
+
+    skipped = correct = wrong = missed = 0
+    latencies = []
+    for case in cases:
+        t0 = time.perf_counter()
+        details, confidence = voice_parser.parse_voice(case["text"], now=NOW)
+        latencies.append(time.perf_counter() - t0)
+        expect = case["expect"]
+        local = confidence >= args.threshold
+        ok = expect is not None and matches(details, expect)
+        if local:
+            skipped += 1
+            correct += ok
+            wrong += not ok
+        elif expect is not None:
+            missed += 1
+        if args.verbose:
+            verdict = ("ok" if ok else "WRONG") if local else ("gemini" if expect is None else "gemini (missed)")
+            print(f"  {confidence:4.2f}  {verdict:<16} {case['text']!r} -> {details['title']!r} {details['due_datetime']}")
+
+    total = len(cases)
+    claimable = sum(c["expect"] is not None for c in cases)
+    print(f"utterances: {total} ({claimable} the local parser should handle), threshold {args.threshold}")
+    print(f"LLM skipped: {skipped}/{total} ({skipped / total:.0%})")
+    print(f"  correct when skipped: {correct}/{skipped}" + (f" ({correct / skipped:.0%})" if skipped else ""))
+    print(f"  wrong when skipped:   {wrong}")
+    print(f"  sent to Gemini though parseable: {missed}")
+    ms = sorted(t * 1000 for t in latencies)
+    print(
+        f"parse latency: mean {statistics.mean(ms):.2f}ms, p95 {ms[int(len(ms) * 0.95) - 1]:.2f}ms, "
+        f"max {ms[-1]:.2f}ms (dateparser load {warmup * 1000:.0f}ms, once per process)"
+    )
+
+
+if __name__ == "__main__":
+    main()
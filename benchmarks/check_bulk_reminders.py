@@ -0,0 +1,88 @@
+# benchmarks/check_bulk_reminders.py
+"""
+Reminder rules of the bulk task writes: marking a task done through
+/tasks/bulk (crud.bulk_save_tasks) must cancel its pending reminders and
+announce each with a reminder_deleted hook, like PATCH and /tasks/bulk-status
+do. Exits non-zero if a done task keeps a pending reminder.
+
+    python benchmarks/check_bulk_reminders.py
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+_tmpdir = tempfile.mkdtemp(prefix="taskai-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from backend.database import SessionLocal, init_db
+import backend.crud as crud
+import backend.models as models
+import backend.schemas as schemas
+
+DUE = datetime(2030, 1, 1, 9)
+
+
+def pending(db, task_ids) -> set:
+    return set(db.scalars(select(models.Reminder.id).where(
+        models.Reminder.task_id.in_(task_ids), models.Reminder.notified == False
+    )))
+
+
+def check(name: str, fn) -> bool:
+    db = SessionLocal()
+    try:
+        fn(db)
+        print(f"ok   {name}")
+        return True
+    except AssertionError as e:
+        print(f"FAIL {name:<40} {e}")
+        return False
+    finally:
+        db.close()
+
+
+def bulk_done_cancels(db):
+    made = crud.bulk_save_tasks(db, [schemas.TaskBulkItem(title=f"t{i}", due_datetime=DUE) for i in range(3)])
+    ids = made["created"]
+    before = pending(db, ids)
+    assert len(before) == 3, f"expected 3 auto-reminders, got {len(before)}"
+
+    deleted = []
+    listener = lambda event, obj_id, obj=None: event == "reminder_deleted" and deleted.append(obj_id)
+    crud.add_listener(listener)
+    try:
+        # one finished, one finished and rescheduled, one only renamed
+        result = crud.bulk_save_tasks(db, [
+            schemas.TaskBulkItem(id=ids[0], status="done"),
+            schemas.TaskBulkItem(id=ids[1], status="done", due_datetime=DUE + timedelta(days=1)),
+            schemas.TaskBulkItem(id=ids[2], title="renamed"),
+        ])
+    finally:
+        crud.remove_listener(listener)
+
+    assert not pending(db, ids[:2]), f"done tasks keep reminders {sorted(pending(db, ids[:2]))}"
+    assert len(pending(db, ids[2:])) == 1, "untouched task lost its reminder"
+    assert result["reminders_cancelled"] == 2 and result["reminders"] == 0, result
+    assert sorted(deleted) == sorted(before - pending(db, ids)), f"reminder_deleted for {deleted}"
+
+
+def bulk_create_done_has_no_reminder(db):
+    made = crud.bulk_save_tasks(db, [schemas.TaskBulkItem(title="already done", status="done", due_datetime=DUE)])
+    assert made["reminders"] == 0 and not pending(db, made["created"]), "done task got an auto-reminder"
+
+
+def main():
+    init_db()
+    results = [
+        check("bulk_save_tasks: done cancels reminders", bulk_done_cancels),
+        check("bulk_save_tasks: created done, no reminder", bulk_create_done_has_no_reminder),
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/check_pagination.py
+"""
+Keyset pagination walks: page through more rows than one page holds, with a
+small limit, and check every task/note comes back exactly once and the walk
+ends. Covers the sync (crud) and async (crud_async) paths. Exits non-zero on
+a repeated, missing or looping page.
+
+    python benchmarks/check_pagination.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+_tmpdir = tempfile.mkdtemp(prefix="taskai-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import AsyncSessionLocal, SessionLocal, dispose_async_engine, engine, init_db
+import backend.crud as crud
+import backend.crud_async as crud_async
+import backend.models as models
+
+ROWS = 53
+LIMIT = 7
+
+
+def seed():
+    init_db()
+    base = datetime(2030, 1, 1)
+    with engine.begin() as conn:
+        # a third without a due date, so the NULL branch of the task keyset is walked too
+        conn.execute(
+            models.Task.__table__.insert(),
+            [{"title": f"task {i}", "status": "pending", "priority": 1 + i % 3, "tags": "",
+              "due_datetime": None if i % 3 == 0 else base + timedelta(hours=i % 5)} for i in range(ROWS)],
+        )
+        # one multi-row insert: every created_at lands in the same second
+        conn.execute(models.Note.__table__.insert(), [{"title": f"note {i}", "content": "x"} for i in range(ROWS)])
+
+
+def walk(fetch_page) -> list:
+    seen, cursor = [], None
+    for _ in range(ROWS):  # more pages than this means the cursor isn't advancing
+        rows, cursor = fetch_page(cursor)
+        seen += [row.id for row in rows]
+        if cursor is None:
+            return seen
+    raise AssertionError(f"no last page after {ROWS} pages (seen {len(seen)} rows)")
+
+
+def check(name: str, fetch_page) -> bool:
+    try:
+        seen = walk(fetch_page)
+        assert len(seen) == len(set(seen)), f"repeated ids: {sorted({i for i in seen if seen.count(i) > 1})[:10]}"
+        assert len(seen) == ROWS, f"{len(seen)} of {ROWS} rows"
+        print(f"ok   {name:<28} {ROWS} rows in pages of {LIMIT}")
+        return True
+    except AssertionError as e:
+        print(f"FAIL {name:<28} {e}")
+        return False
+
+
+def sync_pages(list_page):
+    def fetch_page(cursor):
+        db = SessionLocal()
+        try:
+            return list_page(db, limit=LIMIT, cursor=cursor)
+        finally:
+            db.close()
+    return fetch_page
+
+
+def async_pages(list_page):
+    async def fetch(cursor):
+        async with AsyncSessionLocal() as db:
+            return await list_page(db, limit=LIMIT, cursor=cursor)
+
+    loop = asyncio.new_event_loop()
+    return lambda cursor: loop.run_until_complete(fetch(cursor)), loop
+
+
+def main():
+    seed()
+    results = [
+        check("crud.list_tasks_page", sync_pages(crud.list_tasks_page)),
+        check("crud.list_notes_page", sync_pages(crud.list_notes_page)),
+    ]
+    for name, list_page in [("crud_async.list_tasks_page", crud_async.list_tasks_page),
+                            ("crud_async.list_notes_page", crud_async.list_notes_page)]:
+        fetch_page, loop = async_pages(list_page)
+        results.append(check(name, fetch_page))
+        loop.run_until_complete(dispose_async_engine())
+        loop.close()
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
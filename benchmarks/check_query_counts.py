@@ -0,0 +1,78 @@
+# benchmarks/check_query_counts.py
+"""
+Query-count budget for the task/note read paths, including response
+serialization. Exits non-zero if any path regresses to N+1.
+
+    python benchmarks/check_query_counts.py
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+_tmpdir = tempfile.mkdtemp(prefix="taskai-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.database import SessionLocal, engine, init_db
+import backend.crud as crud
+import backend.models as models
+import backend.schemas as schemas
+from backend.querycount import assert_max_queries
+
+TASKS = 120
+REMINDERS_PER_TASK = 3
+
+
+def seed():
+    init_db()
+    base = datetime(2030, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(
+            models.Task.__table__.insert(),
+            [{"id": i, "title": f"task {i}", "status": "pending", "priority": 1 + i % 3,
+              "due_datetime": base + timedelta(hours=i), "tags": ""} for i in range(1, TASKS + 1)],
+        )
+        conn.execute(
+            models.Reminder.__table__.insert(),
+            [{"task_id": i, "remind_at": base + timedelta(hours=i, minutes=-15 * k), "notified": False}
+             for i in range(1, TASKS + 1) for k in range(REMINDERS_PER_TASK)],
+        )
+        conn.execute(models.Note.__table__.insert(), [{"title": f"note {i}", "content": "x"} for i in range(TASKS)])
+
+
+def check(name: str, budget: int, fn):
+    db = SessionLocal()
+    try:
+        with assert_max_queries(budget) as counter:
+            fn(db)
+        print(f"ok   {name:<28} {counter.count} queries (budget {budget})")
+        return True
+    except AssertionError as e:
+        print(f"FAIL {name:<28} {e}")
+        return False
+    finally:
+        db.close()
+
+
+def list_tasks_page(db):
+    tasks, cursor = crud.list_tasks_page(db, limit=50)
+    [schemas.TaskOut.model_validate(t, from_attributes=True) for t in tasks]
+    tasks, _ = crud.list_tasks_page(db, limit=50, cursor=cursor)
+    [schemas.TaskOut.model_validate(t, from_attributes=True) for t in tasks]
+
+
+def main():
+    seed()
+    results = [
+        # one SELECT for the page + one IN query for its reminders, per page
+        check("list_tasks_page x2", 4, list_tasks_page),
+        check("list_tasks (all)", 2, lambda db: [schemas.TaskOut.model_validate(t, from_attributes=True) for t in crud.list_tasks(db)]),
+        check("get_task", 2, lambda db: schemas.TaskOut.model_validate(crud.get_task(db, 1), from_attributes=True)),
+        check("list_notes_page", 1, lambda db: [schemas.NoteOut.model_validate(n, from_attributes=True) for n in crud.list_notes_page(db, limit=50)[0]]),
+    ]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
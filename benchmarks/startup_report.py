@@ -0,0 +1,73 @@
+# benchmarks/startup_report.py
+"""
+Where backend.app boot time goes.
+
+    python benchmarks/startup_report.py [--top 20]
+
+1. Imports backend.app in a fresh interpreter under `python -X importtime`
+   and lists the slowest imports (cumulative, including their own imports).
+2. Runs the FastAPI lifespan startup/shutdown in-process against a scratch
+   SQLite database and prints the per-phase timings from backend/boot.py.
+
+The ENABLE_* / RUN_MIGRATIONS toggles apply, e.g. ENABLE_STT=0 to leave the
+Whisper workers out.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_tmpdir = tempfile.mkdtemp(prefix="taskai-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+sys.path.insert(0, ROOT)
+
+
+def import_profile(top: int):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.app"],
+        cwd=_tmpdir, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        sys.exit(f"import backend.app failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cum_us), int(self_us), name.rstrip()))
+    total = next((cum for cum, _, name in rows if name.strip() == "backend.app"), 0)
+    print(f"import backend.app: {total / 1000:.0f}ms (interpreter wall time {wall * 1000:.0f}ms)")
+    print(f"  {'cumulative':>10}  {'self':>8}  module")
+    for cum, own, name in sorted(rows, reverse=True)[:top]:
+        print(f"  {cum / 1000:8.0f}ms  {own / 1000:6.0f}ms  {name}")
+
+
+def lifespan_profile():
+    from fastapi.testclient import TestClient
+
+    import backend.app as app_module
+    from backend import boot
+
+    with TestClient(app_module.app):
+        pass
+    print("\nboot phases (this process):")
+    for p in boot.report()["phases"]:
+        print(f"  {p['ms']:8.0f}ms  {p['phase']}" + ("" if p["status"] == "ok" else f"  [{p['status']}]"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--top", type=int, default=20, help="slowest imports to list")
+    args = parser.parse_args()
+    import_profile(args.top)
+    lifespan_profile()
+
+
+if __name__ == "__main__":
+    main()
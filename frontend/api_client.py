@@ -0,0 +1,184 @@
+# frontend/api_client.py
+"""
+Backend access for the Streamlit app.
+
+- One requests.Session per server process (st.cache_resource), so calls reuse
+  keep-alive connections instead of opening a TCP connection per request.
+- List GETs are cached with st.cache_data for FRONTEND_CACHE_TTL seconds, so
+  widget interactions and reruns don't touch the backend at all. When an
+  entry expires it is revalidated with the ETag from last time (304, no body).
+- Writes clear the cached collections they affect, so the rerun that follows
+  a create/update/delete shows it straight away.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+BACKEND_URL = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+CACHE_TTL = float(os.getenv("FRONTEND_CACHE_TTL", "15"))
+TIMEOUT = (5, 30)  # connect, read
+VALIDATORS_MAX = int(os.getenv("FRONTEND_VALIDATORS_MAX", "256"))
+
+# what a write to each collection can change on the backend
+_AFFECTS = {
+    "tasks": ("tasks", "reminders", "dashboard"),  # auto-reminders; deletes cascade
+    "notes": ("notes", "dashboard"),
+    "reminders": ("reminders", "tasks", "dashboard"),  # tasks embed their reminders
+}
+
+
+@st.cache_resource
+def session() -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+class _Validators:
+    """(path, params) -> (etag, data), least recently used first out. Shared by every session, so locked."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+
+@st.cache_resource
+def _validators() -> _Validators:
+    # outlives the TTL cache so expiry costs a 304, not a refetch
+    return _Validators(VALIDATORS_MAX)
+
+
+def _get(path: str, params: tuple = ()):
+    key = (path, params)
+    known = _validators().get(key)
+    headers = {"If-None-Match": known[0]} if known else {}
+    r = session().get(f"{BACKEND_URL}{path}", params=dict(params), headers=headers, timeout=TIMEOUT)
+    if r.status_code == 304 and known:
+        return known[1]
+    r.raise_for_status()
+    data = r.json()
+    if r.headers.get("ETag"):
+        _validators().put(key, (r.headers["ETag"], data))
+    return data
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _tasks(params: tuple):
+    return _get("/tasks", params)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _notes(params: tuple):
+    return _get("/notes", params)
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _reminders():
+    return _get("/reminders")
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _dashboard(params: tuple):
+    return _get("/dashboard", params)
+
+
+_CACHES = {"tasks": _tasks, "notes": _notes, "reminders": _reminders, "dashboard": _dashboard}
+
+
+def invalidate(*collections: str):
+    for name in collections:
+        _CACHES[name].clear()
+
+
+def _params(params: dict) -> tuple:
+    # hashable and order-independent, so equal queries share a cache entry
+    return tuple(sorted((k, v) for k, v in params.items() if v is not None))
+
+
+def list_tasks(**params) -> dict:
+    """One page of GET /tasks (filter, limit, cursor)."""
+    return _tasks(_params(params))
+
+
+def dashboard(**params) -> dict:
+    """GET /dashboard: a task page (filter, limit, cursor), pending reminders with titles, note counts."""
+    return _dashboard(_params(params))
+
+
+def list_notes(**params) -> dict:
+    return _notes(_params(params))
+
+
+def list_reminders() -> list:
+    return _reminders()
+
+
+def _write(method: str, path: str, collection: str, **kwargs) -> requests.Response:
+    """Send a write; on success, drop the cached lists it may have changed. Returns the response."""
+    kwargs.setdefault("timeout", TIMEOUT)
+    r = session().request(method, f"{BACKEND_URL}{path}", **kwargs)
+    if r.ok:
+        invalidate(*_AFFECTS[collection])
+    return r
+
+
+def create_task(payload: dict) -> requests.Response:
+    return _write("POST", "/tasks", "tasks", json=payload)
+
+
+def update_task(task_id: int, payload: dict) -> requests.Response:
+    return _write("PUT", f"/tasks/{task_id}", "tasks", json=payload)
+
+
+def patch_task(task_id: int, changes: dict) -> requests.Response:
+    """PATCH: only the fields in `changes` are sent and changed."""
+    return _write("PATCH", f"/tasks/{task_id}", "tasks", json=changes)
+
+
+def set_task_status(task_ids: list, status: str = "done") -> requests.Response:
+    return _write("POST", "/tasks/bulk-status", "tasks", json={"ids": list(task_ids), "status": status})
+
+
+def delete_task(task_id: int) -> requests.Response:
+    return _write("DELETE", f"/tasks/{task_id}", "tasks")
+
+
+def create_task_from_audio(audio: bytes, content_type: str = "audio/wav") -> requests.Response:
+    # transcription can take a while on a cold worker
+    return _write(
+        "POST", "/tasks/voice/audio", "tasks", data=audio, headers={"Content-Type": content_type}, timeout=(5, 180)
+    )
+
+
+def create_note(payload: dict) -> requests.Response:
+    return _write("POST", "/notes", "notes", json=payload)
+
+
+def delete_note(note_id: int) -> requests.Response:
+    return _write("DELETE", f"/notes/{note_id}", "notes")
+
+
+def post_stream(path: str, payload: dict) -> requests.Response:
+    """A streaming POST (Server-Sent Events) on the shared session; use as a context manager."""
+    return session().post(f"{BACKEND_URL}{path}", json=payload, stream=True, timeout=(5, 120))
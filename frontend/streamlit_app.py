@@ -1,14 +1,70 @@
 # frontend/streamlit_app.py
 import streamlit as st
-import requests
+import hashlib
+import json
 import os
 from datetime import datetime
 import time
 
 import pytz
+
+import api_client as api
+
 IST = pytz.timezone("Asia/Kolkata")
 
-BACKEND_URL = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+PAGE_SIZE = 50
+
+
+def load_page(name, fetch, params, more=False, first=None):
+    """
+    The first page comes from the api_client cache on every rerun (or is passed
+    in, e.g. from the dashboard payload); pages added with "Load more" are kept
+    in session_state until the first page changes.
+    """
+    pages = st.session_state.setdefault("pages", {})
+    key = (name, tuple(sorted(params.items())))
+    if first is None:
+        first = fetch(**params, limit=PAGE_SIZE)
+    entry = pages.get(key)
+    # st.cache_data hands out copies, so compare by value
+    if entry is None or entry["first"] != first:
+        entry = pages[key] = {"first": first, "items": list(first["items"]), "next_cursor": first.get("next_cursor")}
+    if more and entry["next_cursor"]:
+        data = fetch(**params, limit=PAGE_SIZE, cursor=entry["next_cursor"])
+        entry["items"] += data["items"]
+        entry["next_cursor"] = data.get("next_cursor")
+    return entry
+
+
+def reset_pages(name):
+    pages = st.session_state.get("pages", {})
+    for key in [k for k in pages if k[0] == name]:
+        del pages[key]
+
+def stream_ai(path, payload, placeholder, render):
+    """
+    POST to a Server-Sent Events endpoint and re-render the answer in
+    `placeholder` as chunks arrive, instead of waiting for the whole response.
+    """
+    text = ""
+    with api.post_stream(path, payload) as r:
+        r.raise_for_status()
+        event = "message"
+        for line in r.iter_lines(decode_unicode=True):
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:"):
+                data = line[5:].strip()
+                if event == "error":
+                    raise RuntimeError(json.loads(data))
+                if event == "done":
+                    break
+                text += json.loads(data)
+                render(placeholder, text + " ▌")
+            elif not line:
+                event = "message"
+    render(placeholder, text)
+    return text
 
 st.set_page_config(page_title="TaskAI - Assistant Manager", layout="wide")
 
@@ -37,7 +93,7 @@ with st.sidebar.form("add_task", clear_on_submit=True):
             "priority": t_priority,
             "tags": t_tags
         }
-        resp = requests.post(f"{BACKEND_URL}/tasks", json=payload)
+        resp = api.create_task(payload)
         if resp.status_code == 200:
             task = resp.json()
             st.success("Task added ✅")
@@ -46,6 +102,7 @@ with st.sidebar.form("add_task", clear_on_submit=True):
             if "highlight_ids" not in st.session_state:
                 st.session_state["highlight_ids"] = {}
             st.session_state["highlight_ids"][task["id"]] = time.time()
+            reset_pages("tasks")
             st.rerun()
 
 
@@ -58,8 +115,9 @@ with st.sidebar.form("add_note", clear_on_submit=True):
     n_content = st.text_area("Content", key="note_content")
     n_sub = st.form_submit_button("Add Note")
     if n_sub:
-        resp = requests.post(f"{BACKEND_URL}/notes", json={"title": n_title, "content": n_content})
+        resp = api.create_note({"title": n_title, "content": n_content})
         if resp.status_code == 200:
+            reset_pages("notes")
             st.success("Note saved")
         else:
             st.error("Error saving note")
@@ -81,12 +139,21 @@ with tab1:
     params = {}
     if flt != "all":
         params["filter"] = flt
+    if refresh:
+        api.invalidate("dashboard", "tasks", "reminders")
+        reset_pages("tasks")
 
     try:
-        r = requests.get(f"{BACKEND_URL}/tasks", params=params)
-        tasks = r.json()
+        # tasks, reminders and note counts in one round trip; "Load more" pages come from /tasks
+        dash = api.dashboard(**params, limit=PAGE_SIZE)
+        task_page = load_page(
+            "tasks", api.list_tasks, params, more=st.session_state.pop("tasks_more", False), first=dash["tasks"]
+        )
+        tasks = task_page["items"]
     except Exception as e:
         st.error("Cannot contact backend. Make sure FastAPI server is running.")
+        dash = {"reminders": [], "notes": None}
+        task_page = {"items": [], "next_cursor": None}
         tasks = []
 
     if not tasks:
@@ -141,33 +208,25 @@ with tab1:
             c1, c2 = st.columns([1, 1], gap="small")
             with c1:
                 if st.button("✅ Done", key=f"done_{t['id']}"):
-                    payload = {
-                        "title": t["title"],
-                        "description": t.get("description", ""),
-                        "due_datetime": t.get("due_datetime"),
-                        "priority": t.get("priority", 2),
-                        "tags": t.get("tags", ""),
-                        "status": "done",
-                    }
-                    resp = requests.put(f"{BACKEND_URL}/tasks/{t['id']}", json=payload)
+                    resp = api.patch_task(t["id"], {"status": "done"})
                     if resp.status_code == 200:
+                        reset_pages("tasks")
                         st.rerun()
                     else:
                         st.error(f"Error: {resp.text}")
             with c2:
                 if st.button("🗑 Delete", key=f"del_{t['id']}"):
-                    resp = requests.delete(f"{BACKEND_URL}/tasks/{t['id']}")
+                    resp = api.delete_task(t["id"])
                     if resp.status_code == 200:
+                        reset_pages("tasks")
                         st.rerun()
-                        
+
+        if task_page["next_cursor"]:
+            st.button("Load more tasks", on_click=lambda: st.session_state.update(tasks_more=True))
 
     # Show reminders under tasks
     st.subheader("🔔 Reminders")
-    try:
-        rem_resp = requests.get(f"{BACKEND_URL}/reminders")
-        reminders = rem_resp.json()
-    except Exception:
-        reminders = []
+    reminders = dash["reminders"]
 
     if not reminders:
         st.info("No reminders scheduled.")
@@ -179,8 +238,9 @@ with tab1:
                 remind_at_utc = datetime.fromisoformat(remind_at_str.replace("Z", "+00:00"))
                 remind_at_local = remind_at_utc.astimezone(local_tz)
 
+                label = r["task_title"] or f"Task #{r['task_id']}"
                 st.markdown(
-                    f"🔔 **Task #{r['task_id']}** → "
+                    f"🔔 **{label}** → "
                     f"{remind_at_local.strftime('%Y-%m-%d %I:%M %p (%Z)')}"
                 )
             except Exception:
@@ -289,52 +349,67 @@ with tab1:
     audio_bytes = st.audio_input("Record a task")
 
     if audio_bytes is not None:
-        st.info("⏳ Transcribing...")
-        files = {"file": ("voice.wav", audio_bytes, "audio/wav")}
-        try:
-            # Step 1: Transcribe with backend STT
-            stt_resp = requests.post(f"{BACKEND_URL}/stt", files=files, data={"language": "en"})
-            if stt_resp.status_code == 200:
-                text = stt_resp.json().get("text", "").strip()
-                if text:
-                    st.success(f"Recognized: {text}")
-
-                    # Step 2: Create task with recognized text
-                    task_resp = requests.post(f"{BACKEND_URL}/tasks/voice", json={"text": text})
-                    if task_resp.status_code == 200:
-                        new_task = task_resp.json()
-                        st.success(f"✅ Task created: {new_task['title']}")
-                        st.rerun()
-                    else:
-                        st.error(f"Task creation failed: {task_resp.text}")
-                else:
+        audio = audio_bytes.getvalue()
+        digest = hashlib.sha1(audio).hexdigest()
+        # the recording stays in the widget across reruns; only submit it once
+        if st.session_state.get("voice_done", {}).get("digest") != digest:
+            st.info("⏳ Transcribing...")
+            try:
+                # one round trip: silence trimming, transcription and task extraction happen server-side
+                resp = api.create_task_from_audio(audio)
+                if resp.status_code == 200:
+                    st.session_state["voice_done"] = {"digest": digest, "result": resp.json()}
+                    reset_pages("tasks")
+                    st.rerun()
+                elif resp.status_code == 422:
                     st.warning("No speech detected. Please try again.")
-            else:
-                st.error(f"STT failed: {stt_resp.text}")
-        except Exception as e:
-            st.error(f"Error: {e}")
+                else:
+                    st.error(f"Voice task failed: {resp.text}")
+            except Exception as e:
+                st.error(f"Error: {e}")
+        else:
+            result = st.session_state["voice_done"]["result"]
+            st.success(f"Recognized: {result['text']}")
+            st.success(f"✅ Task created: {result['task']['title']}")
+            timings = result["timings_ms"]
+            st.caption(
+                f"{result['speech_seconds']}s of speech in {result['audio_seconds']}s audio · "
+                f"transcribe {timings['transcribe']:.0f}ms · extract {timings['extract']:.0f}ms · "
+                f"total {timings['total']:.0f}ms"
+            )
 
 
 
 with tab2:
-    notes = requests.get(f"{BACKEND_URL}/notes").json()
+    note_page = load_page("notes", api.list_notes, {}, more=st.session_state.pop("notes_more", False))
+    notes = note_page["items"]
 
-    st.subheader("Your Notes")
+    counts = dash["notes"]
+    st.subheader(f"Your Notes ({counts['total']})" if counts else "Your Notes")
+    if counts and counts["tagging_pending"]:
+        st.caption(f"{counts['tagging_pending']} note(s) waiting for tags")
     for n in notes:
         with st.expander(n["title"] or "Untitled"):
             st.write(n["content"])
-            st.caption(f"Tags: {n['tags']}")
+            if n.get("tagging_status") == "pending":
+                st.caption("Tags: generating…")
+            else:
+                st.caption(f"Tags: {n['tags']}")
             st.caption(f"Created at: {n['created_at']}")
 
             # Delete button
             if st.button("Delete", key=f"del_note_{n['id']}"):
-                resp = requests.delete(f"{BACKEND_URL}/notes/{n['id']}")
+                resp = api.delete_note(n["id"])
                 if resp.status_code == 200:
                     st.success("Note deleted successfully")
+                    reset_pages("notes")
                     st.rerun()
                 else:
                     st.error(f"Error: {resp.text}")
 
+    if note_page["next_cursor"]:
+        st.button("Load more notes", on_click=lambda: st.session_state.update(notes_more=True))
+
 with tab3:
     st.header("AI Assistant")
     st.write("Ask natural language questions about your tasks/notes (e.g., 'What is due today?').")
@@ -342,9 +417,7 @@ with tab3:
     if st.button("Ask AI"):
         payload = {"prompt": q}
         try:
-            r = requests.post(f"{BACKEND_URL}/ai/query", json=payload)
-            ans = r.json().get("answer", "")
-            st.success(ans)
+            stream_ai("/ai/query/stream", payload, st.empty(), lambda ph, text: ph.success(text))
         except Exception as e:
             st.error("AI endpoint error: " + str(e))
 
@@ -353,8 +426,7 @@ with tab3:
     text = st.text_area("Text to summarize")
     if st.button("Summarize"):
         try:
-            r = requests.post(f"{BACKEND_URL}/ai/summarize", json={"text": text})
-            st.info(r.json().get("summary", ""))
+            stream_ai("/ai/summarize/stream", {"text": text}, st.empty(), lambda ph, t: ph.info(t))
         except Exception as e:
             st.error("Error: " + str(e))
 